@@ -1,40 +1,232 @@
 """
 WVARA Membership Management System - Main Application
 """
-from flask import Flask, render_template, request, redirect, url_for, flash, session, send_file
-from flask_migrate import Migrate
+from flask import Flask, render_template, request, redirect, url_for, flash, session, g, send_file, send_from_directory, Response, stream_with_context
+from flask_migrate import Migrate, stamp
 from werkzeug.security import generate_password_hash
-from models import db, Member, DuesPayment, RoleHistory, MeetingAttendance, AdminLog
+from models import (db, Member, DuesPayment, RoleHistory, Meeting, MeetingAttendance, AdminLog, MemberStatusRecord, MemberPhoto,
+                    refresh_member_status, member_status_counts, check_in_member, get_data_version, get_member_version,
+                    member_search_available, member_search_expression, member_list_query, search_members,
+                    meeting_attendance_query, rebuild_member_search_index,
+                    STATUS_ACTIVE, STATUS_INACTIVE, STATUS_EXPIRED, STATUS_DISABLED)
 from datetime import datetime, date, timedelta
 from functools import wraps
+from report_cache import ReportCache
+from member_index import MemberPrefixIndex
+from password_hashing import hash_passwords
+from password_verifier import PasswordVerifier, VerifierBusy, fit_request_threads
+from rate_limiter import RateLimiter, create_bucket_store
+from captcha_pool import CaptchaPool, create_captcha_store
+from qrz_photos import QRZPhotoRefresher
+from photo_cache import PhotoStore, MAX_PHOTO_BYTES
+from audit_log import AuditWriter
+from audit_archive import archive_entries, search_archive
+from sqlite_profile import pooled_url, profile_pragmas, apply_sqlite_profile, pragma_report
+from query_plans import check_query_plans
+import click
 import secrets
 import string
+import sys
+import tempfile
+import threading
+import time
 import os
 import csv
 import io
 import re
 import base64
+import json
+from collections import namedtuple
 from reportlab.lib.pagesizes import letter
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.lib.units import inch
-import requests
-from bs4 import BeautifulSoup
-from PIL import Image, ImageDraw, ImageFont
-import random
+
+
+def load_secret_key(path):
+    """SECRET_KEY from the environment, else a key generated once and kept at path so every worker shares it"""
+    if os.environ.get('SECRET_KEY'):
+        return os.environ['SECRET_KEY']
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))  # Created readable by the owner only
+        with os.fdopen(fd, 'w') as f:
+            f.write(secrets.token_hex(32))
+        try:
+            os.link(tmp_path, path)  # Fails if another worker created the key first
+        except FileExistsError:
+            pass
+        finally:
+            os.unlink(tmp_path)
+    with open(path) as f:
+        return f.read().strip()
+
 
 app = Flask(__name__)
-app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', secrets.token_hex(16))
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///WVARA_membership.db'
+app.config['SECRET_KEY'] = load_secret_key(os.path.join(app.instance_path, 'secret_key'))
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///WVARA_membership.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+# SQLite connection PRAGMAs: 'production' (WAL, busy timeout, larger cache) or 'default' (SQLite's own defaults)
+app.config['SQLITE_PROFILE'] = os.environ.get('SQLITE_PROFILE', 'production')
+app.config['SQLITE_BUSY_TIMEOUT_MS'] = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+app.config['SQLITE_SYNCHRONOUS'] = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+app.config['SQLITE_CACHE_SIZE_KB'] = int(os.environ.get('SQLITE_CACHE_SIZE_KB', 20000))
+app.config['SQLITE_MMAP_SIZE'] = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+
+# Connection pool per worker process (file databases only; in-memory SQLite has a single connection)
+if pooled_url(app.config['SQLALCHEMY_DATABASE_URI']):
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': float(os.environ.get('DB_POOL_TIMEOUT', 30)),
+    }
+
+# Rows fetched per round trip and bytes buffered per chunk when streaming CSV reports
+CSV_FETCH_SIZE = 500
+CSV_FLUSH_BYTES = 16 * 1024
+
+# Member list paging
+MEMBERS_PER_PAGE = 50
+MAX_PER_PAGE = 200
+MEMBER_SORT_COLUMNS = {
+    'call_sign': Member.call_sign,
+    'last_name': Member.last_name,
+    'join_date': Member.join_date,
+}
+
+# Admin log paging; archive searches return at most AUDIT_ARCHIVE_SEARCH_LIMIT entries
+AUDIT_PER_PAGE = 50
+AUDIT_ARCHIVE_SEARCH_LIMIT = 500
+AUDIT_ARCHIVE_BATCH = 1000
+
+# Generated reports are cached on disk until the data version changes
+app.config['REPORT_CACHE_DIR'] = os.environ.get('REPORT_CACHE_DIR', os.path.join(app.instance_path, 'report_cache'))
+app.config['REPORT_CACHE_MAX_ENTRIES'] = int(os.environ.get('REPORT_CACHE_MAX_ENTRIES', 32))
+
+# Login password checks run on a bounded pool; beyond the queue limit logins are told to retry.
+# Workers + queue are capped at WEB_THREADS - 1 (request threads per process, as in gunicorn.conf.py)
+# so one thread is always left for other pages
+app.config['WEB_THREADS'] = int(os.environ.get('WEB_THREADS', 4))
+app.config['PASSWORD_VERIFY_WORKERS'] = int(os.environ.get('PASSWORD_VERIFY_WORKERS', 2))
+app.config['PASSWORD_VERIFY_QUEUE'] = int(os.environ.get('PASSWORD_VERIFY_QUEUE', 1))
+app.config['PASSWORD_VERIFY_TIMEOUT'] = float(os.environ.get('PASSWORD_VERIFY_TIMEOUT', 2.0))
+
+# Login rate limits (token buckets). Use the sqlite backend when running several worker processes
+app.config['LOGIN_RATE_LIMIT_BACKEND'] = os.environ.get('LOGIN_RATE_LIMIT_BACKEND', 'memory')
+app.config['LOGIN_RATE_LIMIT_DB'] = os.environ.get('LOGIN_RATE_LIMIT_DB', os.path.join(app.instance_path, 'rate_limits.db'))
+app.config['LOGIN_IP_BURST'] = int(os.environ.get('LOGIN_IP_BURST', 30))
+app.config['LOGIN_IP_PER_MINUTE'] = float(os.environ.get('LOGIN_IP_PER_MINUTE', 10))
+app.config['LOGIN_CALL_SIGN_BURST'] = int(os.environ.get('LOGIN_CALL_SIGN_BURST', 5))
+app.config['LOGIN_CALL_SIGN_PER_MINUTE'] = float(os.environ.get('LOGIN_CALL_SIGN_PER_MINUTE', 1))
+
+# Kiosk check-ins per client IP, in the same bucket store; one kiosk checks in a whole meeting
+app.config['CHECKIN_IP_BURST'] = int(os.environ.get('CHECKIN_IP_BURST', 60))
+app.config['CHECKIN_IP_PER_MINUTE'] = float(os.environ.get('CHECKIN_IP_PER_MINUTE', 30))
+
+# CAPTCHAs are pre-rendered in the background; unanswered ones expire after CAPTCHA_TTL seconds
+app.config['CAPTCHA_POOL_SIZE'] = int(os.environ.get('CAPTCHA_POOL_SIZE', 64))
+app.config['CAPTCHA_TTL'] = int(os.environ.get('CAPTCHA_TTL', 600))
+# Issued CAPTCHAs; use the sqlite backend when running several worker processes
+app.config['CAPTCHA_STORE_BACKEND'] = os.environ.get('CAPTCHA_STORE_BACKEND', 'memory')
+app.config['CAPTCHA_STORE_DB'] = os.environ.get('CAPTCHA_STORE_DB', os.path.join(app.instance_path, 'captchas.db'))
+
+# QRZ photo lookups (QRZ_BASE_URL can point at a local stub server for testing)
+app.config['QRZ_BASE_URL'] = os.environ.get('QRZ_BASE_URL', 'https://www.qrz.com')
+app.config['QRZ_MAX_WORKERS'] = int(os.environ.get('QRZ_MAX_WORKERS', 4))
+app.config['QRZ_REQUEST_INTERVAL'] = float(os.environ.get('QRZ_REQUEST_INTERVAL', 0.5))
+app.config['QRZ_NEGATIVE_TTL'] = int(os.environ.get('QRZ_NEGATIVE_TTL', 86400))
+
+# Member photo thumbnails; file names are content hashes, so browsers may cache them for a year
+app.config['PHOTO_DIR'] = os.environ.get('PHOTO_DIR', os.path.join(app.static_folder, 'photos'))
+app.config['PHOTO_MAX_AGE'] = 365 * 24 * 3600
+
+# A cached admin flag is dropped as soon as any member row changes (member_version);
+# this is the longest it is trusted when the database is edited outside the app
+app.config['ADMIN_FLAG_TTL'] = int(os.environ.get('ADMIN_FLAG_TTL', 30))
+
+# Admin log entries are written in batches; AUDIT_LOG_MODE=sync writes each one before responding
+app.config['AUDIT_LOG_MODE'] = os.environ.get('AUDIT_LOG_MODE', 'batched')
+app.config['AUDIT_FLUSH_INTERVAL'] = float(os.environ.get('AUDIT_FLUSH_INTERVAL', 2.0))
+app.config['AUDIT_BATCH_SIZE'] = int(os.environ.get('AUDIT_BATCH_SIZE', 100))
+
+# Admin log entries older than AUDIT_RETENTION_DAYS are moved to monthly compressed archives
+app.config['AUDIT_RETENTION_DAYS'] = int(os.environ.get('AUDIT_RETENTION_DAYS', 365))
+app.config['AUDIT_ARCHIVE_DIR'] = os.environ.get('AUDIT_ARCHIVE_DIR', os.path.join(app.instance_path, 'audit_archive'))
+
 db.init_app(app)
-migrate = Migrate(app, db)
+with app.app_context():
+    apply_sqlite_profile(db.engine, profile_pragmas(app.config))
+migrate = Migrate(app, db, directory=os.path.join(app.root_path, 'migrations'))
+report_cache = ReportCache(app.config['REPORT_CACHE_DIR'], app.config['REPORT_CACHE_MAX_ENTRIES'])
+member_index = MemberPrefixIndex()
+admin_flag_cache = {}  # call sign -> (has admin access, member version, expires at)
+admin_flag_lock = threading.Lock()
+password_verifier = PasswordVerifier(*fit_request_threads(app.config['PASSWORD_VERIFY_WORKERS'],
+                                                          app.config['PASSWORD_VERIFY_QUEUE'],
+                                                          app.config['WEB_THREADS']),
+                                     app.config['PASSWORD_VERIFY_TIMEOUT'])
+captcha_pool = CaptchaPool(app.config['CAPTCHA_POOL_SIZE'], app.config['CAPTCHA_TTL'],
+                           create_captcha_store(app.config['CAPTCHA_STORE_BACKEND'], app.config['CAPTCHA_STORE_DB']))
+qrz_refresher = QRZPhotoRefresher(app.config['QRZ_BASE_URL'],
+                                  max_workers=app.config['QRZ_MAX_WORKERS'],
+                                  per_host_interval=app.config['QRZ_REQUEST_INTERVAL'],
+                                  negative_ttl=app.config['QRZ_NEGATIVE_TTL'],
+                                  status_path=os.path.join(app.instance_path, 'photo_refresh.json'))
+photo_store = PhotoStore(app.config['PHOTO_DIR'])
+rate_limit_store = create_bucket_store(app.config['LOGIN_RATE_LIMIT_BACKEND'], app.config['LOGIN_RATE_LIMIT_DB'])
+login_ip_limiter = RateLimiter(rate_limit_store, 'ip', app.config['LOGIN_IP_BURST'], app.config['LOGIN_IP_PER_MINUTE'])
+login_call_sign_limiter = RateLimiter(rate_limit_store, 'call_sign', app.config['LOGIN_CALL_SIGN_BURST'],
+                                      app.config['LOGIN_CALL_SIGN_PER_MINUTE'])
+checkin_ip_limiter = RateLimiter(rate_limit_store, 'checkin_ip', app.config['CHECKIN_IP_BURST'],
+                                 app.config['CHECKIN_IP_PER_MINUTE'])
+
+
+def write_audit_entries(entries):
+    """Insert a batch of admin log entries in one transaction"""
+    with app.app_context():
+        db.session.execute(db.insert(AdminLog), entries)
+        db.session.commit()
+
+
+audit_writer = AuditWriter(write_audit_entries, app.config['AUDIT_FLUSH_INTERVAL'], app.config['AUDIT_BATCH_SIZE'])
 
 
 # Utility Functions
 
+def get_current_member():
+    """The logged-in member, loaded at most once per request"""
+    if 'current_member' not in g:
+        call_sign = session.get('call_sign')
+        g.current_member = Member.query.filter_by(call_sign=call_sign).first() if call_sign else None
+    return g.current_member
+
+
+def current_member_is_admin():
+    """Whether the logged-in member is an active admin, cached until any member changes"""
+    call_sign = session.get('call_sign')
+    now = time.monotonic()
+    # Shared by all workers, so a change made in one process is seen by the others
+    version = get_member_version()
+    with admin_flag_lock:
+        cached = admin_flag_cache.get(call_sign)
+    if cached and cached[1] == version and cached[2] > now:
+        return cached[0]
+    
+    member = get_current_member()
+    is_admin = bool(member and member.is_admin and member.is_active)
+    with admin_flag_lock:
+        admin_flag_cache[call_sign] = (is_admin, version, now + app.config['ADMIN_FLAG_TTL'])
+    return is_admin
+
+
+def invalidate_admin_flag(call_sign):
+    """Forget a cached admin flag after the member's admin or active status changes"""
+    with admin_flag_lock:
+        admin_flag_cache.pop(call_sign, None)
+
+
 def login_required(f):
     """Decorator to require login"""
     @wraps(f)
@@ -54,8 +246,7 @@ def admin_required(f):
             flash('Please log in to access this page.', 'warning')
             return redirect(url_for('login'))
         
-        member = Member.query.filter_by(call_sign=session['call_sign']).first()
-        if not member or not member.is_admin:
+        if not current_member_is_admin():
             flash('You do not have permission to access this page.', 'danger')
             return redirect(url_for('dashboard'))
         
@@ -63,17 +254,109 @@ def admin_required(f):
     return decorated_function
 
 
-def log_admin_action(action, target_member_call_sign=None, details=None):
-    """Log administrative action"""
-    log_entry = AdminLog(
-        admin_call_sign=session.get('call_sign', 'SYSTEM'),
-        action=action,
-        target_member_call_sign=target_member_call_sign,
-        details=details,
-        ip_address=request.remote_addr
-    )
-    db.session.add(log_entry)
-    db.session.commit()
+def cached_report(f):
+    """Decorator to serve a report from the report cache with ETag/Last-Modified"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        today = date.today()
+        version, changed_at = get_data_version()
+        key = ReportCache.make_key(request.endpoint, sorted(request.args.items(multi=True)), version, today)
+        
+        cached = report_cache.get(key)
+        if cached is None:
+            response = f(*args, **kwargs)
+            if response is None or response.status_code != 200:
+                return response
+            
+            meta = {
+                'mimetype': response.mimetype,
+                'content_disposition': response.headers.get('Content-Disposition')
+            }
+            try:
+                cached = report_cache.put(key, response.iter_encoded(), meta)
+            finally:
+                response.close()
+        
+        path, meta = cached
+        
+        # Reports also change with the date (titles, filenames, dues status)
+        last_modified = max(changed_at, datetime.combine(today, datetime.min.time()))
+        
+        response = send_file(path, mimetype=meta['mimetype'], etag=key,
+                             last_modified=last_modified, max_age=0, conditional=True)
+        response.cache_control.private = True
+        if meta['content_disposition']:
+            response.headers['Content-Disposition'] = meta['content_disposition']
+        return response
+    return decorated_function
+
+
+def get_member_index():
+    """Return the member picker index, rebuilding it if members changed"""
+    version = get_member_version()
+    if member_index.version != version:
+        rows = db.session.query(
+            Member.id, Member.call_sign, Member.first_name, Member.last_name
+        ).filter(Member.is_active == True).all()
+        member_index.rebuild(rows, version)
+    return member_index
+
+
+def too_many_attempts(retry_after):
+    """429 response for a rate-limited login client"""
+    response = app.make_response((render_template('rate_limited.html', retry_after=retry_after), 429))
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
+
+def create_database():
+    """Create any missing tables; a brand-new database is marked as up to date with the migrations"""
+    is_new = not db.inspect(db.engine).has_table('members')
+    db.create_all()
+    if is_new:
+        stamp()
+
+
+def database_report():
+    """Database URL, pool settings and the effective SQLite PRAGMAs"""
+    return {
+        'url': db.engine.url.render_as_string(hide_password=True),
+        'profile': app.config['SQLITE_PROFILE'],
+        'pool': db.engine.pool.status(),
+        'pragmas': pragma_report(db.engine),
+    }
+
+
+def database_report_lines():
+    """The database report as text lines"""
+    report = database_report()
+    yield f"Database: {report['url']} (profile: {report['profile']})"
+    yield f"  Pool: {report['pool']}"
+    for name, value in report['pragmas'].items():
+        yield f"  PRAGMA {name} = {value}"
+
+
+def print_database_report():
+    """Print the database report at startup"""
+    for line in database_report_lines():
+        print(line)
+
+
+def log_admin_action(action, target_member_call_sign=None, details=None, sync=False):
+    """Log administrative action (queued for the audit writer unless sync)"""
+    entry = {
+        'admin_call_sign': session.get('call_sign', 'SYSTEM'),
+        'action': action,
+        'target_member_call_sign': target_member_call_sign,
+        'details': details,
+        'ip_address': request.remote_addr,
+        'created_at': datetime.utcnow(),
+    }
+    if sync or app.config['AUDIT_LOG_MODE'] == 'sync':
+        db.session.add(AdminLog(**entry))
+        db.session.commit()
+    else:
+        audit_writer.add(entry)
 
 
 def validate_password(password):
@@ -103,121 +386,180 @@ def generate_temp_password(length=12):
     return password
 
 
+Page = namedtuple('Page', ['items', 'next_cursor', 'prev_cursor'])
+
+
+def encode_cursor(value, row_id):
+    """Encode a keyset position (sort value, id) as an opaque URL-safe token"""
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    return base64.urlsafe_b64encode(json.dumps([value, row_id]).encode()).decode()
+
+
+def decode_cursor(token, sort_column):
+    """Decode a cursor token for sort_column; returns None if missing or malformed"""
+    if not token:
+        return None
+    try:
+        value, row_id = json.loads(base64.urlsafe_b64decode(token.encode()))
+        python_type = sort_column.type.python_type
+        if python_type in (date, datetime) and value is not None:
+            value = python_type.fromisoformat(value)
+        return value, int(row_id)
+    except (ValueError, TypeError):
+        return None
+
+
+def keyset_page(query, sort_column, id_column, per_page, after=None, before=None, descending=False):
+    """
+    Fetch one page of query ordered by (sort_column, id_column) using keyset
+    pagination, so the cost depends on the page size rather than the offset.
+    
+    after/before are cursor tokens from a previous Page. With descending,
+    pages run from the largest sort value down.
+    """
+    after = decode_cursor(after, sort_column)
+    before = decode_cursor(before, sort_column)
+    
+    def beyond(position, larger):
+        value, row_id = position
+        if larger:
+            return db.or_(sort_column > value, db.and_(sort_column == value, id_column > row_id))
+        return db.or_(sort_column < value, db.and_(sort_column == value, id_column < row_id))
+    
+    forward_order = (sort_column.desc(), id_column.desc()) if descending else (sort_column, id_column)
+    backward_order = (sort_column, id_column) if descending else (sort_column.desc(), id_column.desc())
+    
+    if before:
+        rows = query.filter(beyond(before, larger=descending)).order_by(*backward_order).limit(per_page + 1).all()
+        has_prev = len(rows) > per_page
+        items = list(reversed(rows[:per_page]))
+        has_next = True
+    else:
+        if after:
+            query = query.filter(beyond(after, larger=not descending))
+        rows = query.order_by(*forward_order).limit(per_page + 1).all()
+        has_next = len(rows) > per_page
+        items = rows[:per_page]
+        has_prev = after is not None
+    
+    def cursor_for(item):
+        return encode_cursor(getattr(item, sort_column.key), getattr(item, id_column.key))
+    
+    return Page(
+        items=items,
+        next_cursor=cursor_for(items[-1]) if items and has_next else None,
+        prev_cursor=cursor_for(items[0]) if items and has_prev else None
+    )
+
+
+def parse_date_arg(name):
+    """Parse an optional YYYY-MM-DD query string argument"""
+    try:
+        return datetime.strptime(request.args.get(name, ''), '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+
+def format_percent(count, total):
+    """Format count/total as a whole percentage for reports"""
+    if not total:
+        return ''
+    return f'{round(100 * count / total)}%'
+
+
+def stream_csv(filename, header, rows):
+    """
+    Stream a CSV download without building the whole file in memory.
+    
+    rows is any iterable of row lists, typically a generator over a
+    query using yield_per(CSV_FETCH_SIZE).
+    """
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(header)
+        
+        for row in rows:
+            writer.writerow(row)
+            if buffer.tell() >= CSV_FLUSH_BYTES:
+                yield buffer.getvalue().encode('utf-8')
+                buffer.seek(0)
+                buffer.truncate()
+        
+        yield buffer.getvalue().encode('utf-8')
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
+
+
 def scrape_qrz_photo(call_sign):
-    """Scrape photo URL from QRZ.com"""
+    """Photo URL from QRZ.com for an explicit refresh click (bypasses the lookup cache)"""
     try:
-        url = f"https://www.qrz.com/db/{call_sign.upper()}"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=5)
-        
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            # Look for the profile image
-            img_tag = soup.find('img', {'class': 'main-photo'})
-            if not img_tag:
-                # Try alternative selector
-                img_tag = soup.find('img', alt=re.compile(call_sign, re.IGNORECASE))
-            
-            if img_tag and img_tag.get('src'):
-                photo_url = img_tag['src']
-                if not photo_url.startswith('http'):
-                    photo_url = 'https://www.qrz.com' + photo_url
-                return photo_url
+        return qrz_refresher.lookup(call_sign, force=True)
     except Exception as e:
         print(f"Error scraping QRZ for {call_sign}: {e}")
     
     return None
 
 
-def generate_captcha():
-    """Generate an image-based CAPTCHA"""
-    # Generate random word (5 characters)
-    chars = 'ABCDEFGHJKLMNPQRSTUVWXYZ23456789'  # Excluding confusing characters
-    captcha_text = ''.join(random.choice(chars) for _ in range(5))
-    
-    # Create image
-    width, height = 200, 80
-    image = Image.new('RGB', (width, height), color='white')
-    draw = ImageDraw.Draw(image)
-    
-    # Add background noise lines
-    for _ in range(5):
-        x1, y1 = random.randint(0, width), random.randint(0, height)
-        x2, y2 = random.randint(0, width), random.randint(0, height)
-        draw.line([(x1, y1), (x2, y2)], fill=(200, 200, 200), width=2)
-    
-    # Try to use a system font, fall back to default if not available
-    try:
-        from PIL import ImageFont
-        # Try common system fonts
-        font_paths = [
-            '/System/Library/Fonts/Supplemental/Arial Bold.ttf',  # macOS
-            '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',  # Linux
-            'C:\\Windows\\Fonts\\arialbd.ttf',  # Windows
-        ]
-        font = None
-        for font_path in font_paths:
-            try:
-                font = ImageFont.truetype(font_path, 48)
-                break
-            except:
-                continue
-        if font is None:
-            font = ImageFont.load_default()
-    except:
-        font = None
-    
-    # Draw text with slight variations
-    x_start = 20
-    for i, char in enumerate(captcha_text):
-        # Random position variation
-        x = x_start + (i * 32) + random.randint(-3, 3)
-        y = 15 + random.randint(-5, 5)
-        
-        # Random color (dark colors)
-        color = (
-            random.randint(0, 100),
-            random.randint(0, 100),
-            random.randint(0, 100)
-        )
-        
-        # Draw character
-        if font:
-            draw.text((x, y), char, fill=color, font=font)
-        else:
-            draw.text((x, y), char, fill=color)
-    
-    # Add some noise dots
-    for _ in range(100):
-        x, y = random.randint(0, width), random.randint(0, height)
-        draw.point((x, y), fill=(random.randint(150, 200), random.randint(150, 200), random.randint(150, 200)))
+def cache_member_photo(member):
+    """
+    Download member.qrz_photo_url once and store its thumbnails locally.
+    Returns False if the photo could not be fetched; the caller commits.
+    """
+    if not member.qrz_photo_url:
+        return False
+    if member.photo and member.photo.source_url == member.qrz_photo_url:
+        return True
     
-    # Save to bytes
-    import io
-    img_io = io.BytesIO()
-    image.save(img_io, 'PNG')
-    img_io.seek(0)
+    try:
+        content_hash = photo_store.store(qrz_refresher.download(member.qrz_photo_url, MAX_PHOTO_BYTES))
+    except Exception as e:
+        print(f"Error caching photo for {member.call_sign}: {e}")
+        return False
     
-    # Store text in session
-    session['captcha'] = captcha_text
+    if member.photo is None:
+        member.photo = MemberPhoto(source_url=member.qrz_photo_url, content_hash=content_hash)
+        return True
     
-    # Return base64 encoded image
-    import base64
-    img_base64 = base64.b64encode(img_io.getvalue()).decode()
+    old_hash = member.photo.content_hash
+    member.photo.source_url = member.qrz_photo_url
+    member.photo.content_hash = content_hash
+    member.photo.cached_at = datetime.utcnow()
     
-    return img_base64
+    # Drop the old thumbnails unless another member has the same picture
+    if old_hash != content_hash and not MemberPhoto.query.filter(
+        MemberPhoto.content_hash == old_hash, MemberPhoto.member_id != member.id
+    ).count():
+        photo_store.remove(old_hash)
+    return True
+
+
+def save_qrz_photos(photos):
+    """Store {call_sign: photo_url} found by the batch refresher and cache any new photos"""
+    with app.app_context():
+        for member in Member.query.filter(Member.call_sign.in_(photos)).options(db.joinedload(Member.photo)):
+            if member.qrz_photo_url != photos[member.call_sign]:
+                member.qrz_photo_url = photos[member.call_sign]
+            cache_member_photo(member)
+        db.session.commit()
+
+
+def generate_captcha():
+    """Issue a CAPTCHA for this session; returns its image URL"""
+    token = captcha_pool.issue()
+    session['captcha_token'] = token
+    return url_for('captcha_image', token=token)
 
 
 def verify_captcha(user_input):
-    """Verify CAPTCHA input"""
-    if 'captcha' not in session:
-        return False
-    
-    captcha = session.get('captcha', '')
-    # Case-insensitive comparison, remove spaces
-    return user_input.upper().replace(' ', '') == captcha.upper().replace(' ', '')
+    """Verify CAPTCHA input against the answer held for this session's token"""
+    token = session.pop('captcha_token', None)
+    return token is not None and captcha_pool.verify(token, user_input)
 
 
 # Routes
@@ -233,20 +575,35 @@ def index():
 @app.route('/login', methods=['GET', 'POST'])
 def login():
     """Login page"""
+    # Every login request costs a CAPTCHA render or a password check, so limit clients up front
+    retry_after = login_ip_limiter.hit(request.remote_addr)
+    if retry_after:
+        return too_many_attempts(retry_after)
+    
     if request.method == 'POST':
         call_sign = request.form.get('call_sign', '').upper().strip()
         password = request.form.get('password', '')
         captcha_input = request.form.get('captcha', '')
         
+        # Only failed attempts are charged to the call sign; refuse once its bucket is empty
+        retry_after = login_call_sign_limiter.hit(call_sign, cost=0)
+        if retry_after:
+            return too_many_attempts(retry_after)
+        
         # Verify CAPTCHA first
         if not verify_captcha(captcha_input):
             flash('Invalid CAPTCHA. Please try again.', 'danger')
-            generate_captcha()  # Generate new one
             return redirect(url_for('login'))
         
         member = Member.query.filter_by(call_sign=call_sign).first()
         
-        if member and member.check_password(password):
+        try:
+            password_ok = member is not None and password_verifier.verify(member.password_hash, password)
+        except VerifierBusy:
+            flash('The server is busy right now. Please try again in a few seconds.', 'warning')
+            return redirect(url_for('login'))
+        
+        if password_ok:
             session['call_sign'] = member.call_sign
             session['is_admin'] = member.is_admin
             
@@ -263,14 +620,14 @@ def login():
             
             return redirect(url_for('dashboard'))
         else:
+            login_call_sign_limiter.hit(call_sign)
             flash('Invalid call sign or password', 'danger')
-            generate_captcha()  # Generate new one for retry
             return redirect(url_for('login'))
     
-    # Generate CAPTCHA for GET request
-    captcha_text = generate_captcha()
+    # Generate CAPTCHA for GET request (every retry comes back here for a new one)
+    captcha_url = generate_captcha()
     
-    return render_template('login.html', captcha=captcha_text)
+    return render_template('login.html', captcha_url=captcha_url)
 
 
 @app.route('/logout')
@@ -281,18 +638,41 @@ def logout():
     return redirect(url_for('login'))
 
 
+@app.route('/photos/<path:filename>')
+def member_photo_file(filename):
+    """Cached member thumbnail; the name changes whenever the picture does"""
+    response = send_from_directory(app.config['PHOTO_DIR'], filename, max_age=app.config['PHOTO_MAX_AGE'])
+    response.cache_control.immutable = True
+    return response
+
+
 @app.route('/refresh_captcha')
 def refresh_captcha():
     """Generate new CAPTCHA"""
-    captcha_text = generate_captcha()
-    return {'captcha': captcha_text}
+    retry_after = login_ip_limiter.hit(request.remote_addr)
+    if retry_after:
+        return too_many_attempts(retry_after)
+    
+    return {'captcha_url': generate_captcha()}
+
+
+@app.route('/captcha/<token>.png')
+def captcha_image(token):
+    """CAPTCHA image; each token's image never changes, so the browser may cache it"""
+    png = captcha_pool.image(token)
+    if png is None:
+        return 'CAPTCHA expired', 404
+    response = Response(png, mimetype='image/png')
+    response.cache_control.private = True
+    response.cache_control.max_age = app.config['CAPTCHA_TTL']
+    return response
 
 
 @app.route('/dashboard')
 @login_required
 def dashboard():
     """Member dashboard"""
-    member = Member.query.filter_by(call_sign=session['call_sign']).first()
+    member = get_current_member()
     
     # Get current dues status
     current_year = date.today().year
@@ -321,7 +701,7 @@ def dashboard():
 @login_required
 def profile():
     """View/edit member profile"""
-    member = Member.query.filter_by(call_sign=session['call_sign']).first()
+    member = get_current_member()
     
     if request.method == 'POST':
         action = request.form.get('action', 'update_info')
@@ -330,6 +710,7 @@ def profile():
             photo_url = scrape_qrz_photo(member.call_sign)
             if photo_url:
                 member.qrz_photo_url = photo_url
+                cache_member_photo(member)
                 db.session.commit()
                 flash('QRZ photo updated successfully!', 'success')
             else:
@@ -369,7 +750,7 @@ def profile():
 @login_required
 def change_password():
     """Change password"""
-    member = Member.query.filter_by(call_sign=session['call_sign']).first()
+    member = get_current_member()
     
     if request.method == 'POST':
         current_password = request.form.get('current_password')
@@ -409,29 +790,27 @@ def change_password():
 def admin_dashboard():
     """Admin dashboard"""
     total_members = Member.query.count()
-    all_members = Member.query.filter_by(is_active=True).all()
+    status_counts = member_status_counts()
     
     # Calculate members with paid dues
-    members_with_paid_dues = sum(1 for m in all_members if m.is_dues_current())
+    members_with_paid_dues = status_counts.get(STATUS_ACTIVE, 0) + status_counts.get(STATUS_INACTIVE, 0)
     
     # Calculate truly active members (dues paid + recent activity in last 6 months)
-    truly_active = sum(1 for m in all_members if m.is_truly_active())
+    truly_active = status_counts.get(STATUS_ACTIVE, 0)
     
     # Members with expiring/expired dues
-    current_year = date.today().year
     current_date = date.today()
     
-    # Check dues status for each
-    expired_dues = []
-    expiring_soon = []
+    expired_dues = Member.query.join(MemberStatusRecord).filter(
+        MemberStatusRecord.status_category == STATUS_EXPIRED
+    ).order_by(Member.call_sign).all()
     
-    for member in all_members:
-        if not member.is_dues_current():
-            expired_dues.append(member)
-        else:
-            # Check if it's December (dues expiring in next month)
-            if current_date.month == 12:
-                expiring_soon.append(member)
+    # Check if it's December (dues expiring in next month)
+    expiring_soon = []
+    if current_date.month == 12:
+        expiring_soon = Member.query.join(MemberStatusRecord).filter(
+            MemberStatusRecord.status_category.in_([STATUS_ACTIVE, STATUS_INACTIVE])
+        ).all()
     
     # Recent activity
     recent_attendance = MeetingAttendance.query.order_by(
@@ -458,43 +837,77 @@ def admin_members():
     """View all members"""
     search = request.args.get('search', '')
     status_filter = request.args.get('status', 'all')  # all, active, inactive, expired
+    ranked_search = bool(search) and member_search_available() and member_search_expression(search) is not None
+    # A search lists the best matches first unless another order is picked
+    sort = request.args.get('sort', 'relevance' if ranked_search else 'call_sign')
+    if sort not in MEMBER_SORT_COLUMNS and not (sort == 'relevance' and ranked_search):
+        sort = 'call_sign'
+    per_page = min(max(request.args.get('per_page', MEMBERS_PER_PAGE, type=int), 1), MAX_PER_PAGE)
     
-    query = Member.query
+    query = member_list_query(search, status_filter)
     
     if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            db.or_(
-                Member.call_sign.ilike(search_term),
-                Member.first_name.ilike(search_term),
-                Member.last_name.ilike(search_term),
-                Member.email.ilike(search_term)
-            )
-        )
+        # Only a search needs an exact count; it narrows the list to a few rows
+        total = query.count()
+    else:
+        status_counts = member_status_counts()
+        if status_filter in (STATUS_ACTIVE, STATUS_INACTIVE, STATUS_EXPIRED, STATUS_DISABLED):
+            total = status_counts.get(status_filter, 0)
+        else:
+            total = sum(count for category, count in status_counts.items() if category != STATUS_DISABLED)
     
-    # Apply status filter
-    all_members = query.order_by(Member.call_sign).all()
-    
-    if status_filter == 'active':
-        # Truly active: dues paid + activity in last 6 months
-        members = [m for m in all_members if m.is_active and m.is_truly_active()]
-    elif status_filter == 'inactive':
-        # Inactive: dues paid but no recent activity
-        members = [m for m in all_members if m.is_active and m.is_dues_current() and not m.has_recent_activity()]
-    elif status_filter == 'expired':
-        # Expired: dues not current
-        members = [m for m in all_members if m.is_active and not m.is_dues_current()]
-    elif status_filter == 'disabled':
-        # Disabled accounts
-        members = [m for m in all_members if not m.is_active]
+    if sort == 'relevance':
+        # bm25 order cannot be paged by key; show the best per_page matches
+        members = search_members(search, per_page, query)
+        page = None
     else:
-        # All active accounts
-        members = [m for m in all_members if m.is_active]
+        page = keyset_page(query, MEMBER_SORT_COLUMNS[sort], Member.id, per_page,
+                           after=request.args.get('after'), before=request.args.get('before'))
+        members = page.items
     
     return render_template('admin/members.html',
                          members=members,
+                         page=page,
+                         total=total,
                          search=search,
-                         status_filter=status_filter)
+                         ranked_search=ranked_search,
+                         status_filter=status_filter,
+                         sort=sort,
+                         per_page=per_page)
+
+
+@app.route('/admin/members/autocomplete')
+@admin_required
+def member_autocomplete():
+    """Typeahead for member pickers (active members by call sign or name prefix)"""
+    query = request.args.get('q', '')
+    limit = max(min(request.args.get('limit', 10, type=int), 50), 1)
+    return {'results': get_member_index().search(query, limit)}
+
+
+@app.route('/admin/members/reset-passwords', methods=['POST'])
+@admin_required
+def admin_reset_passwords():
+    """Issue new temporary passwords to the selected members"""
+    member_ids = request.form.getlist('member_ids', type=int)
+    members = Member.query.filter(Member.id.in_(member_ids)).order_by(Member.call_sign).all()
+    
+    if not members:
+        flash('No members selected', 'warning')
+        return redirect(url_for('admin_members'))
+    
+    temp_passwords = [generate_temp_password() for _ in members]
+    for member, password_hash in zip(members, hash_passwords(temp_passwords)):
+        member.password_hash = password_hash
+        member.password_is_temporary = True
+    db.session.commit()
+    
+    for member in members:
+        log_admin_action('Reset password', member.call_sign, 'Bulk reset')
+    
+    # Shown once on this page rather than flashed, so the passwords never go into the session cookie
+    return render_template('admin/reset_passwords.html',
+                         resets=list(zip(members, temp_passwords)))
 
 
 @app.route('/admin/member/add', methods=['GET', 'POST'])
@@ -542,6 +955,8 @@ def admin_add_member():
         new_member.password_is_temporary = True
         
         db.session.add(new_member)
+        db.session.flush()
+        refresh_member_status([new_member.id])
         db.session.commit()
         
         log_admin_action('Added new member', call_sign, f'Initial password: {call_sign}')
@@ -604,12 +1019,15 @@ def admin_member_detail(member_id):
         elif action == 'toggle_admin':
             member.is_admin = not member.is_admin
             db.session.commit()
-            log_admin_action(f'{"Granted" if member.is_admin else "Revoked"} admin access', member.call_sign)
+            invalidate_admin_flag(member.call_sign)
+            log_admin_action(f'{"Granted" if member.is_admin else "Revoked"} admin access', member.call_sign, sync=True)
             flash(f'Admin access {"granted" if member.is_admin else "revoked"} for {member.call_sign}', 'success')
         
         elif action == 'toggle_active':
             member.is_active = not member.is_active
+            refresh_member_status([member.id])
             db.session.commit()
+            invalidate_admin_flag(member.call_sign)
             log_admin_action(f'{"Activated" if member.is_active else "Deactivated"} member', member.call_sign)
             flash(f'Member {member.call_sign} {"activated" if member.is_active else "deactivated"}', 'success')
         
@@ -625,6 +1043,7 @@ def admin_member_detail(member_id):
             photo_url = scrape_qrz_photo(member.call_sign)
             if photo_url:
                 member.qrz_photo_url = photo_url
+                cache_member_photo(member)
                 db.session.commit()
                 flash('QRZ photo updated successfully!', 'success')
             else:
@@ -635,7 +1054,8 @@ def admin_member_detail(member_id):
             call_sign = member.call_sign
             db.session.delete(member)
             db.session.commit()
-            log_admin_action('Deleted member', call_sign)
+            invalidate_admin_flag(call_sign)
+            log_admin_action('Deleted member', call_sign, sync=True)
             flash(f'Member {call_sign} has been permanently deleted', 'success')
             return redirect(url_for('admin_members'))
         
@@ -670,7 +1090,9 @@ def admin_dues():
             
             # Check if payment already exists
             existing = DuesPayment.query.filter_by(member_id=member_id, year=year).first()
-            if existing:
+            if not member_id or not Member.query.get(member_id):
+                flash('Please select a member from the list.', 'danger')
+            elif existing:
                 flash('Dues payment for this year already recorded. Use Edit to modify.', 'warning')
             else:
                 payment = DuesPayment(
@@ -683,6 +1105,7 @@ def admin_dues():
                     created_by=session['call_sign']
                 )
                 db.session.add(payment)
+                refresh_member_status([member_id])
                 db.session.commit()
                 
                 member = Member.query.get(member_id)
@@ -693,13 +1116,22 @@ def admin_dues():
             payment_id = request.form.get('payment_id')
             payment = DuesPayment.query.get(payment_id)
             
-            if payment:
-                payment.year = int(request.form.get('year'))
+            year = int(request.form.get('year'))
+            duplicate = payment and DuesPayment.query.filter(
+                DuesPayment.member_id == payment.member_id,
+                DuesPayment.year == year,
+                DuesPayment.id != payment.id
+            ).first()
+            if duplicate:
+                flash(f'{payment.member.call_sign} already has a dues payment for {year}. Edit that payment instead.', 'warning')
+            elif payment:
+                payment.year = year
                 payment.amount = float(request.form.get('amount'))
                 payment.payment_date = datetime.strptime(request.form.get('payment_date'), '%Y-%m-%d').date()
                 payment.payment_method = request.form.get('payment_method', 'PayPal')
                 payment.notes = request.form.get('notes', '')
                 
+                refresh_member_status([payment.member_id])
                 db.session.commit()
                 log_admin_action(f'Updated dues payment for {payment.year}', payment.member.call_sign)
                 flash('Dues payment updated successfully!', 'success')
@@ -712,56 +1144,122 @@ def admin_dues():
                 member_call = payment.member.call_sign
                 year = payment.year
                 db.session.delete(payment)
+                refresh_member_status([payment.member_id])
                 db.session.commit()
                 log_admin_action(f'Deleted dues payment for {year}', member_call)
                 flash('Dues payment deleted successfully!', 'success')
         
         return redirect(url_for('admin_dues'))
     
-    # Get all active members
-    members = Member.query.filter_by(is_active=True).order_by(Member.call_sign).all()
-    
-    # Get most recent payment for each member
-    member_payment_data = []
     current_year = date.today().year
+    sort = request.args.get('sort', 'recent')
+    page = request.args.get('page', 1, type=int)
+    per_page = min(max(request.args.get('per_page', MEMBERS_PER_PAGE, type=int), 1), MAX_PER_PAGE)
+    
+    # Most recent payment per member in one query (row_number over each member's payments)
+    ranked = db.session.query(
+        DuesPayment.id.label('payment_id'),
+        DuesPayment.member_id.label('member_id'),
+        db.func.row_number().over(
+            partition_by=DuesPayment.member_id,
+            order_by=(DuesPayment.year.desc(), DuesPayment.payment_date.desc())
+        ).label('position')
+    ).subquery()
+    
+    query = db.session.query(Member, DuesPayment, MemberStatusRecord.dues_current).outerjoin(
+        ranked, db.and_(ranked.c.member_id == Member.id, ranked.c.position == 1)
+    ).outerjoin(
+        DuesPayment, DuesPayment.id == ranked.c.payment_id
+    ).outerjoin(
+        MemberStatusRecord
+    ).filter(Member.is_active == True)
+    
+    if sort == 'call_sign':
+        query = query.order_by(Member.call_sign)
+    elif sort == 'name':
+        query = query.order_by(Member.last_name, Member.first_name, Member.call_sign)
+    else:
+        # Most recent payment year (descending), then by payment date
+        sort = 'recent'
+        query = query.order_by(
+            DuesPayment.year.desc().nullslast(),
+            DuesPayment.payment_date.desc().nullslast(),
+            Member.call_sign
+        )
     
-    for member in members:
-        # Get most recent payment for this member
-        most_recent_payment = DuesPayment.query.filter_by(
-            member_id=member.id
-        ).order_by(DuesPayment.year.desc(), DuesPayment.payment_date.desc()).first()
-        
-        # Determine status based on current year
-        if most_recent_payment and most_recent_payment.year == current_year:
-            status = 'paid'
-        else:
-            status = 'expired'
-        
-        member_payment_data.append({
+    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    
+    member_payment_data = [
+        {
             'member': member,
-            'payment': most_recent_payment,
-            'status': status
-        })
-    
-    # Sort by most recent payment year (descending), then by payment date
-    member_payment_data.sort(
-        key=lambda x: (
-            x['payment'].year if x['payment'] else 0,
-            x['payment'].payment_date if x['payment'] else date.min
-        ),
-        reverse=True
-    )
+            'payment': payment,
+            # Same dues status as every other page, grace period included
+            'status': 'paid' if dues_current else 'expired'
+        }
+        for member, payment, dues_current in pagination.items
+    ]
     
     return render_template('admin/dues.html', 
-                         members=members,
                          member_payment_data=member_payment_data,
+                         pagination=pagination,
+                         sort=sort,
+                         per_page=per_page,
                          current_year=current_year)
 
 
-@app.template_filter('get_attendance_for_date')
-def get_attendance_for_date(meeting_date):
-    """Get all attendance records for a specific date"""
-    return MeetingAttendance.query.filter_by(meeting_date=meeting_date).all()
+@app.route('/admin/dues/matrix')
+@admin_required
+def admin_dues_matrix():
+    """Multi-year paid/unpaid matrix (members x years)"""
+    current_year = date.today().year
+    end_year = request.args.get('end_year', current_year, type=int)
+    year_count = min(max(request.args.get('years', 5, type=int), 1), 20)
+    years = list(range(end_year - year_count + 1, end_year + 1))
+    sort = request.args.get('sort', 'call_sign')
+    page = request.args.get('page', 1, type=int)
+    per_page = min(max(request.args.get('per_page', MEMBERS_PER_PAGE, type=int), 1), MAX_PER_PAGE)
+    
+    # One aggregate: a paid flag per member per year
+    year_flags = db.session.query(
+        DuesPayment.member_id.label('member_id'),
+        *[
+            db.func.max(db.case((DuesPayment.year == year, 1), else_=0)).label(f'paid_{year}')
+            for year in years
+        ]
+    ).filter(
+        DuesPayment.year.between(years[0], years[-1])
+    ).group_by(DuesPayment.member_id).subquery()
+    
+    paid_columns = [db.func.coalesce(year_flags.c[f'paid_{year}'], 0) for year in years]
+    years_paid = sum(paid_columns[1:], paid_columns[0]).label('years_paid')
+    
+    query = db.session.query(Member, years_paid, *paid_columns).outerjoin(
+        year_flags, year_flags.c.member_id == Member.id
+    ).filter(Member.is_active == True)
+    
+    if sort == 'name':
+        query = query.order_by(Member.last_name, Member.first_name, Member.call_sign)
+    elif sort == 'years_paid':
+        query = query.order_by(years_paid.desc(), Member.call_sign)
+    else:
+        sort = 'call_sign'
+        query = query.order_by(Member.call_sign)
+    
+    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    rows = [
+        {'member': member, 'years_paid': paid_count, 'paid': [bool(flag) for flag in flags]}
+        for member, paid_count, *flags in pagination.items
+    ]
+    
+    return render_template('admin/dues_matrix.html',
+                         rows=rows,
+                         years=years,
+                         year_count=year_count,
+                         end_year=end_year,
+                         pagination=pagination,
+                         sort=sort,
+                         per_page=per_page,
+                         current_year=current_year)
 
 
 @app.route('/admin/attendance', methods=['GET', 'POST'])
@@ -775,26 +1273,68 @@ def admin_attendance():
             meeting_date = datetime.strptime(request.form.get('meeting_date'), '%Y-%m-%d').date()
             event_type = request.form.get('event_type', 'Meeting')
             event_name = request.form.get('event_name', '')
-            attended_members = request.form.getlist('attended')
+            attended_members = request.form.getlist('attended', type=int)
             
-            # Delete existing attendance for this date (in case of correction)
-            MeetingAttendance.query.filter_by(meeting_date=meeting_date).delete()
-            
-            # Record new attendance
-            for member_id in attended_members:
-                attendance = MeetingAttendance(
-                    member_id=int(member_id),
+            # Same date, type and name is a correction of that meeting; anything else is a new meeting
+            meeting = Meeting.query.filter_by(
+                meeting_date=meeting_date,
+                event_type=event_type,
+                event_name=event_name
+            ).first()
+            if meeting is None:
+                meeting = Meeting(
                     meeting_date=meeting_date,
-                    attended=True,
                     event_type=event_type,
                     event_name=event_name,
                     recorded_by=session['call_sign']
                 )
-                db.session.add(attendance)
+                db.session.add(meeting)
+                db.session.flush()
+            
+            # Apply only the difference between the stored and submitted rosters. The form
+            # lists active members only, so other ids are ignored and inactive members'
+            # attendance is left alone
+            submitted = {member_id for (member_id,) in db.session.query(Member.id).filter(
+                Member.id.in_(attended_members),
+                Member.is_active == True
+            )}
+            stored = {member_id for (member_id,) in meeting_attendance_query(meeting.id).join(Member).filter(
+                Member.is_active == True
+            ).with_entities(MeetingAttendance.member_id)}
+            added = submitted - stored
+            removed = stored - submitted
+            
+            if removed:
+                meeting_attendance_query(meeting.id).filter(
+                    MeetingAttendance.member_id.in_(removed)
+                ).delete(synchronize_session=False)
             
+            if added:
+                db.session.execute(db.insert(MeetingAttendance), [
+                    {
+                        'member_id': member_id,
+                        'meeting_id': meeting.id,
+                        'meeting_date': meeting_date,
+                        'attended': True,
+                        'recorded_by': session['call_sign']
+                    }
+                    for member_id in added
+                ])
+            
+            changed_call_signs = dict(db.session.query(Member.id, Member.call_sign).filter(
+                Member.id.in_(added | removed)
+            ).all())
+            
+            refresh_member_status(added | removed)
             db.session.commit()
-            log_admin_action('Recorded meeting attendance', details=f'Date: {meeting_date}, Type: {event_type}, Attendees: {len(attended_members)}')
-            flash(f'Attendance recorded for {len(attended_members)} members', 'success')
+            
+            added_calls = ', '.join(sorted(changed_call_signs[member_id] for member_id in added)) or 'none'
+            removed_calls = ', '.join(sorted(changed_call_signs[member_id] for member_id in removed)) or 'none'
+            log_admin_action('Recorded meeting attendance', details=(
+                f'Date: {meeting_date}, Type: {event_type}, Attendees: {len(submitted)}, '
+                f'Added: {added_calls}, Removed: {removed_calls}'
+            ))
+            flash(f'Attendance recorded for {len(submitted)} members ({len(added)} added, {len(removed)} removed)', 'success')
         
         elif action == 'remove_attendee':
             # Remove individual attendee from a meeting
@@ -804,37 +1344,98 @@ def admin_attendance():
                 member_call = attendance.member.call_sign
                 event_date = attendance.meeting_date
                 db.session.delete(attendance)
+                refresh_member_status([attendance.member_id])
                 db.session.commit()
                 log_admin_action('Removed attendee from event', member_call, f'Date: {event_date}')
                 flash(f'Removed {member_call} from attendance', 'success')
         
         elif action == 'delete':
-            meeting_date = datetime.strptime(request.form.get('meeting_date'), '%Y-%m-%d').date()
-            MeetingAttendance.query.filter_by(meeting_date=meeting_date).delete()
-            db.session.commit()
-            log_admin_action('Deleted attendance record', details=f'Date: {meeting_date}')
-            flash(f'Attendance record for {meeting_date} deleted', 'success')
+            meeting = Meeting.query.get(request.form.get('meeting_id'))
+            if meeting:
+                previous_members = [record.member_id for record in meeting.attendance]
+                meeting_date = meeting.meeting_date
+                db.session.delete(meeting)
+                refresh_member_status(previous_members)
+                db.session.commit()
+                log_admin_action('Deleted attendance record', details=f'Date: {meeting_date}, Event: {meeting.get_label()}')
+                flash(f'Attendance record for {meeting_date} deleted', 'success')
+        
+        elif action == 'open_checkin':
+            meeting = Meeting.query.get(request.form.get('meeting_id'))
+            if meeting:
+                if not meeting.checkin_token:
+                    meeting.checkin_token = secrets.token_urlsafe(16)
+                    db.session.commit()
+                    log_admin_action('Opened self check-in', details=f'Date: {meeting.meeting_date}, Event: {meeting.get_label()}')
+                return redirect(url_for('checkin', token=meeting.checkin_token))
+        
+        elif action == 'close_checkin':
+            meeting = Meeting.query.get(request.form.get('meeting_id'))
+            if meeting and meeting.checkin_token:
+                meeting.checkin_token = None
+                db.session.commit()
+                log_admin_action('Closed self check-in', details=f'Date: {meeting.meeting_date}, Event: {meeting.get_label()}')
+                flash(f'Self check-in closed for {meeting.get_label()}', 'success')
         
         return redirect(url_for('admin_attendance'))
     
     # Get active members
     members = Member.query.filter_by(is_active=True).order_by(Member.call_sign).all()
     
-    # Get recent meetings with details
-    recent_meetings_query = db.session.query(
-        MeetingAttendance.meeting_date,
-        MeetingAttendance.event_type,
-        MeetingAttendance.event_name,
-        db.func.count(MeetingAttendance.id).label('count')
-    ).group_by(
-        MeetingAttendance.meeting_date,
-        MeetingAttendance.event_type,
-        MeetingAttendance.event_name
-    ).order_by(MeetingAttendance.meeting_date.desc()).limit(10).all()
+    # Get recent meetings with their rosters and members in one eager-loaded query
+    recent_meetings = Meeting.query.options(
+        db.joinedload(Meeting.attendance).joinedload(MeetingAttendance.member)
+    ).order_by(Meeting.meeting_date.desc(), Meeting.id.desc()).limit(10).all()
     
     return render_template('admin/attendance.html', 
                          members=members, 
-                         recent_meetings=recent_meetings_query)
+                         recent_meetings=recent_meetings)
+
+
+def checkin_count(meeting):
+    """Number of members checked in to a meeting"""
+    return meeting_attendance_query(meeting.id).count()
+
+
+@app.route('/checkin/<token>', methods=['GET', 'POST'])
+def checkin(token):
+    """Self-service check-in kiosk for an open meeting"""
+    meeting = Meeting.query.filter_by(checkin_token=token).first_or_404()
+    
+    if request.method == 'POST':
+        retry_after = checkin_ip_limiter.hit(request.remote_addr)
+        if retry_after:
+            flash(f'Too many check-ins from this device. Please wait about {retry_after} seconds and try again.', 'warning')
+            response = app.make_response((render_template('checkin.html',
+                                                          meeting=meeting,
+                                                          attendee_count=checkin_count(meeting)), 429))
+            response.headers['Retry-After'] = str(retry_after)
+            return response
+        
+        call_sign = request.form.get('call_sign', '').upper().strip()
+        member = Member.query.filter_by(call_sign=call_sign, is_active=True).first()
+        
+        if not member:
+            flash(f'Call sign {call_sign} not found. Please see a club officer.', 'danger')
+        elif check_in_member(meeting, member):
+            db.session.commit()
+            flash(f'Welcome, {member.first_name}! You are checked in.', 'success')
+        else:
+            db.session.rollback()
+            flash(f'{member.call_sign} is already checked in. Thanks!', 'info')
+        
+        return redirect(url_for('checkin', token=token))
+    
+    return render_template('checkin.html',
+                         meeting=meeting,
+                         attendee_count=checkin_count(meeting))
+
+
+@app.route('/checkin/<token>/count')
+def checkin_status(token):
+    """Live attendee count polled by the kiosk page"""
+    meeting = Meeting.query.filter_by(checkin_token=token).first_or_404()
+    return {'count': checkin_count(meeting)}
 
 
 @app.route('/admin/roles', methods=['GET', 'POST'])
@@ -850,6 +1451,10 @@ def admin_roles():
             start_date = datetime.strptime(request.form.get('start_date'), '%Y-%m-%d').date()
             notes = request.form.get('notes', '')
             
+            if not member_id or not Member.query.get(member_id):
+                flash('Please select a member from the list.', 'danger')
+                return redirect(url_for('admin_roles'))
+            
             role = RoleHistory(
                 member_id=member_id,
                 role_name=role_name,
@@ -881,10 +1486,105 @@ def admin_roles():
     # Get all current roles
     current_roles = RoleHistory.query.filter_by(is_current=True).order_by(RoleHistory.start_date.desc()).all()
     
-    # Get all members for dropdown
-    members = Member.query.filter_by(is_active=True).order_by(Member.call_sign).all()
+    return render_template('admin/roles.html', current_roles=current_roles)
+
+
+@app.route('/admin/photos', methods=['GET', 'POST'])
+@admin_required
+def admin_photos():
+    """Refresh QRZ photos for every active member in the background"""
+    if request.method == 'POST':
+        call_signs = [call_sign for (call_sign,) in db.session.query(Member.call_sign).filter_by(is_active=True)]
+        if qrz_refresher.start(call_signs, save_qrz_photos):
+            log_admin_action('Started QRZ photo refresh', details=f'Members: {len(call_signs)}')
+            flash(f'Refreshing QRZ photos for {len(call_signs)} members', 'success')
+        else:
+            flash('A photo refresh is already running', 'warning')
+        return redirect(url_for('admin_photos'))
+    
+    with_photo = Member.query.filter(Member.is_active == True, Member.qrz_photo_url.isnot(None)).count()
+    active = Member.query.filter_by(is_active=True).count()
     
-    return render_template('admin/roles.html', current_roles=current_roles, members=members)
+    return render_template('admin/photos.html',
+                         progress=qrz_refresher.progress(),
+                         with_photo=with_photo,
+                         active=active)
+
+
+@app.route('/admin/photos/status')
+@admin_required
+def admin_photos_status():
+    """Progress of the current or last photo refresh"""
+    return {'progress': qrz_refresher.progress()}
+
+
+@app.route('/admin/audit')
+@admin_required
+def admin_audit():
+    """Browse and filter the admin log, newest first; older entries come from the archive"""
+    admin_filter = request.args.get('admin', '').strip().upper()
+    target_filter = request.args.get('target', '').strip().upper()
+    text = request.args.get('q', '').strip()
+    start = parse_date_arg('start')
+    end = parse_date_arg('end')
+    source = 'archive' if request.args.get('source') == 'archive' else 'live'
+    per_page = min(max(request.args.get('per_page', AUDIT_PER_PAGE, type=int), 1), MAX_PER_PAGE)
+    
+    page = None
+    entries = []
+    if source == 'archive':
+        entries = search_archive(app.config['AUDIT_ARCHIVE_DIR'], start, end, admin_filter or None,
+                                 target_filter or None, text or None, limit=AUDIT_ARCHIVE_SEARCH_LIMIT)
+    else:
+        query = AdminLog.query
+        if admin_filter:
+            query = query.filter(AdminLog.admin_call_sign == admin_filter)
+        if target_filter:
+            query = query.filter(AdminLog.target_member_call_sign == target_filter)
+        if text:
+            search_term = f"%{text}%"
+            query = query.filter(db.or_(AdminLog.action.ilike(search_term), AdminLog.details.ilike(search_term)))
+        if start:
+            query = query.filter(AdminLog.created_at >= datetime.combine(start, datetime.min.time()))
+        if end:
+            query = query.filter(AdminLog.created_at < datetime.combine(end + timedelta(days=1), datetime.min.time()))
+        
+        page = keyset_page(query, AdminLog.created_at, AdminLog.id, per_page,
+                           after=request.args.get('after'), before=request.args.get('before'), descending=True)
+        entries = page.items
+    
+    filters = {
+        'admin': admin_filter,
+        'target': target_filter,
+        'q': text,
+        'start': start.isoformat() if start else '',
+        'end': end.isoformat() if end else '',
+        'source': source,
+        'per_page': per_page,
+    }
+    return render_template('admin/audit.html',
+                         entries=entries,
+                         page=page,
+                         filters=filters,
+                         archive_limit=AUDIT_ARCHIVE_SEARCH_LIMIT,
+                         retention_days=app.config['AUDIT_RETENTION_DAYS'])
+
+
+@app.route('/admin/metrics')
+@admin_required
+def admin_metrics():
+    """Runtime metrics for this worker process"""
+    return {
+        'database': database_report(),
+        'password_verifier': password_verifier.stats(),
+        'audit_log': audit_writer.stats(),
+        'login_rate_limits': {
+            'backend': app.config['LOGIN_RATE_LIMIT_BACKEND'],
+            'ip': login_ip_limiter.stats(),
+            'call_sign': login_call_sign_limiter.stats(),
+            'checkin_ip': checkin_ip_limiter.stats(),
+        },
+    }
 
 
 @app.route('/admin/reports')
@@ -896,21 +1596,18 @@ def admin_reports():
 
 @app.route('/admin/reports/directory')
 @admin_required
+@cached_report
 def report_directory():
     """Generate member directory"""
     format = request.args.get('format', 'pdf')
     
-    members = Member.query.filter_by(is_active=True).order_by(Member.last_name, Member.first_name).all()
-    
     if format == 'csv':
-        # Generate CSV
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow(['Call Sign', 'Name', 'Email', 'Phone', 'Address', 'City', 'State', 'ZIP', 
-                        'FCC Class', 'Membership Type', 'Join Date', 'Dues Current'])
+        query = db.session.query(Member, MemberStatusRecord.dues_current).outerjoin(
+            MemberStatusRecord
+        ).filter(Member.is_active == True).order_by(Member.last_name, Member.first_name)
         
-        for member in members:
-            writer.writerow([
+        rows = (
+            [
                 member.call_sign,
                 member.get_full_name(),
                 member.email,
@@ -922,15 +1619,16 @@ def report_directory():
                 member.fcc_license_class or '',
                 member.membership_type,
                 member.join_date.strftime('%Y-%m-%d'),
-                'Yes' if member.is_dues_current() else 'No'
-            ])
+                'Yes' if dues_current else 'No'
+            ]
+            for member, dues_current in query.yield_per(CSV_FETCH_SIZE)
+        )
         
-        output.seek(0)
-        return send_file(
-            io.BytesIO(output.getvalue().encode('utf-8')),
-            mimetype='text/csv',
-            as_attachment=True,
-            download_name=f'WVARA_directory_{date.today().strftime("%Y%m%d")}.csv'
+        return stream_csv(
+            f'WVARA_directory_{date.today().strftime("%Y%m%d")}.csv',
+            ['Call Sign', 'Name', 'Email', 'Phone', 'Address', 'City', 'State', 'ZIP',
+             'FCC Class', 'Membership Type', 'Join Date', 'Dues Current'],
+            rows
         )
     
     else:  # PDF
@@ -954,6 +1652,7 @@ def report_directory():
         # Table
         data = [['Call Sign', 'Name', 'Email', 'Phone', 'City, State']]
         
+        members = Member.query.filter_by(is_active=True).order_by(Member.last_name, Member.first_name).all()
         for member in members:
             location = f"{member.city or ''}, {member.state or ''}".strip(', ')
             data.append([
@@ -991,152 +1690,168 @@ def report_directory():
 
 @app.route('/admin/reports/dues_status')
 @admin_required
+@cached_report
 def report_dues_status():
     """Generate dues status report"""
     format = request.args.get('format', 'csv')
     current_year = date.today().year
     
-    members = Member.query.filter_by(is_active=True).order_by(Member.last_name, Member.first_name).all()
-    
     if format == 'csv':
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow(['Call Sign', 'Name', 'Email', 'Membership Type', 'Dues Current', 
-                        f'{current_year} Payment Date', f'{current_year} Amount'])
+        query = db.session.query(Member, MemberStatusRecord.dues_current, DuesPayment).outerjoin(
+            MemberStatusRecord
+        ).outerjoin(
+            DuesPayment, db.and_(DuesPayment.member_id == Member.id, DuesPayment.year == current_year)
+        ).filter(Member.is_active == True).order_by(Member.last_name, Member.first_name)
         
-        for member in members:
-            payment = member.get_current_dues_status()
-            writer.writerow([
+        rows = (
+            [
                 member.call_sign,
                 member.get_full_name(),
                 member.email,
                 member.membership_type,
-                'Yes' if member.is_dues_current() else 'No',
+                'Yes' if dues_current else 'No',
                 payment.payment_date.strftime('%Y-%m-%d') if payment else '',
                 f'${payment.amount:.2f}' if payment else ''
-            ])
+            ]
+            for member, dues_current, payment in query.yield_per(CSV_FETCH_SIZE)
+        )
         
-        output.seek(0)
-        return send_file(
-            io.BytesIO(output.getvalue().encode('utf-8')),
-            mimetype='text/csv',
-            as_attachment=True,
-            download_name=f'WVARA_dues_status_{date.today().strftime("%Y%m%d")}.csv'
+        return stream_csv(
+            f'WVARA_dues_status_{date.today().strftime("%Y%m%d")}.csv',
+            ['Call Sign', 'Name', 'Email', 'Membership Type', 'Dues Current',
+             f'{current_year} Payment Date', f'{current_year} Amount'],
+            rows
         )
 
 
 @app.route('/admin/reports/attendance')
 @admin_required
+@cached_report
 def report_attendance():
     """Generate attendance report"""
     format = request.args.get('format', 'csv')
     
-    # Get last 12 meetings with event info
-    meetings = db.session.query(
-        MeetingAttendance.meeting_date,
-        MeetingAttendance.event_name,
-        MeetingAttendance.event_type
-    ).distinct().order_by(
-        MeetingAttendance.meeting_date.desc()
-    ).limit(12).all()
-    
-    meetings_list = list(meetings)
+    # Optional date range (YYYY-MM-DD) and meeting count; default is the last 12 meetings
+    start_date = parse_date_arg('start')
+    end_date = parse_date_arg('end')
+    default_count = None if (start_date or end_date) else 12
+    meeting_count = request.args.get('meetings', default_count, type=int)
+    
+    # Get meetings in range with event info
+    meetings_query = Meeting.query
+    if start_date:
+        meetings_query = meetings_query.filter(Meeting.meeting_date >= start_date)
+    if end_date:
+        meetings_query = meetings_query.filter(Meeting.meeting_date <= end_date)
+    meetings_query = meetings_query.order_by(Meeting.meeting_date.desc(), Meeting.id.desc())
+    if meeting_count:
+        meetings_query = meetings_query.limit(meeting_count)
+    
+    meetings_list = list(meetings_query.all())
     meetings_list.reverse()  # Chronological order
     
-    members = Member.query.filter_by(is_active=True).order_by(Member.last_name, Member.first_name).all()
+    members_query = Member.query.filter_by(is_active=True).order_by(Member.last_name, Member.first_name)
     
-    output = io.StringIO()
-    writer = csv.writer(output)
+    # Fetch every (member, meeting) pair for these meetings once and pivot in memory
+    attended = set()
+    if meetings_list:
+        attended = set(db.session.query(
+            MeetingAttendance.member_id,
+            MeetingAttendance.meeting_id
+        ).filter(
+            MeetingAttendance.meeting_id.in_([meeting.id for meeting in meetings_list])
+        ).all())
     
     # Header with event names
     header = ['Call Sign', 'Name']
     for meeting in meetings_list:
-        event_label = f"{meeting.meeting_date.strftime('%Y-%m-%d')}: {meeting.event_name or meeting.event_type}"
+        event_label = f"{meeting.meeting_date.strftime('%Y-%m-%d')}: {meeting.get_label()}"
         header.append(event_label)
-    header.append('Total')
-    writer.writerow(header)
+    header.extend(['Total', 'Attendance %'])
     
-    # Data
-    for member in members:
-        row = [member.call_sign, member.get_full_name()]
-        total = 0
+    def rows():
+        meeting_totals = [0] * len(meetings_list)
+        member_count = 0
         
-        for meeting in meetings_list:
-            attendance = MeetingAttendance.query.filter_by(
-                member_id=member.id,
-                meeting_date=meeting.meeting_date
-            ).first()
+        for member in members_query.yield_per(CSV_FETCH_SIZE):
+            row = [member.call_sign, member.get_full_name()]
+            total = 0
+            member_count += 1
             
-            if attendance:
-                row.append('X')
-                total += 1
-            else:
-                row.append('')
+            for i, meeting in enumerate(meetings_list):
+                if (member.id, meeting.id) in attended:
+                    row.append('X')
+                    total += 1
+                    meeting_totals[i] += 1
+                else:
+                    row.append('')
+            
+            row.append(total)
+            row.append(format_percent(total, len(meetings_list)))
+            yield row
         
-        row.append(total)
-        writer.writerow(row)
-    
-    output.seek(0)
-    return send_file(
-        io.BytesIO(output.getvalue().encode('utf-8')),
-        mimetype='text/csv',
-        as_attachment=True,
-        download_name=f'WVARA_attendance_{date.today().strftime("%Y%m%d")}.csv'
+        # Per-meeting summary rows
+        yield ['', 'Attendees'] + meeting_totals + [sum(meeting_totals), '']
+        yield ['', 'Attendance %'] + [format_percent(count, member_count) for count in meeting_totals] + ['', '']
+    
+    return stream_csv(
+        f'WVARA_attendance_{date.today().strftime("%Y%m%d")}.csv',
+        header,
+        rows()
     )
 
 
 @app.route('/admin/reports/mailing_labels')
 @admin_required
+@cached_report
 def report_mailing_labels():
     """Generate mailing labels"""
-    members = Member.query.filter_by(is_active=True).order_by(Member.zip_code, Member.last_name).all()
-    
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(['Name', 'Address', 'City', 'State', 'ZIP'])
-    
-    for member in members:
-        if member.address and member.city and member.state and member.zip_code:
-            writer.writerow([
-                member.get_full_name(),
-                member.address,
-                member.city,
-                member.state,
-                member.zip_code
-            ])
+    query = Member.query.filter(
+        Member.is_active == True,
+        Member.address != None, Member.address != '',
+        Member.city != None, Member.city != '',
+        Member.state != None, Member.state != '',
+        Member.zip_code != None, Member.zip_code != ''
+    ).order_by(Member.zip_code, Member.last_name)
+    
+    rows = (
+        [
+            member.get_full_name(),
+            member.address,
+            member.city,
+            member.state,
+            member.zip_code
+        ]
+        for member in query.yield_per(CSV_FETCH_SIZE)
+    )
     
-    output.seek(0)
-    return send_file(
-        io.BytesIO(output.getvalue().encode('utf-8')),
-        mimetype='text/csv',
-        as_attachment=True,
-        download_name=f'WVARA_mailing_labels_{date.today().strftime("%Y%m%d")}.csv'
+    return stream_csv(
+        f'WVARA_mailing_labels_{date.today().strftime("%Y%m%d")}.csv',
+        ['Name', 'Address', 'City', 'State', 'ZIP'],
+        rows
     )
 
 
 @app.route('/admin/reports/email_list')
 @admin_required
+@cached_report
 def report_email_list():
     """Generate email distribution list"""
-    members = Member.query.filter_by(is_active=True).order_by(Member.last_name, Member.first_name).all()
+    query = Member.query.filter_by(is_active=True).order_by(Member.last_name, Member.first_name)
     
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(['Call Sign', 'Name', 'Email'])
-    
-    for member in members:
-        writer.writerow([
+    rows = (
+        [
             member.call_sign,
             member.get_full_name(),
             member.email
-        ])
+        ]
+        for member in query.yield_per(CSV_FETCH_SIZE)
+    )
     
-    output.seek(0)
-    return send_file(
-        io.BytesIO(output.getvalue().encode('utf-8')),
-        mimetype='text/csv',
-        as_attachment=True,
-        download_name=f'WVARA_email_list_{date.today().strftime("%Y%m%d")}.csv'
+    return stream_csv(
+        f'WVARA_email_list_{date.today().strftime("%Y%m%d")}.csv',
+        ['Call Sign', 'Name', 'Email'],
+        rows
     )
 
 
@@ -1144,11 +1859,89 @@ def report_email_list():
 @app.cli.command()
 def init_db():
     """Initialize the database"""
-    db.create_all()
+    create_database()
     print("Database initialized!")
 
 
+@app.cli.command()
+def rebuild_member_status():
+    """Recompute member_status for every member (run nightly from cron)"""
+    refresh_member_status()
+    db.session.commit()
+    print("Member status rebuilt!")
+
+
+@app.cli.command()
+def rebuild_search_index():
+    """Create (if needed) and repopulate the member full-text search index"""
+    rebuild_member_search_index()
+    db.session.commit()
+    print("Member search index rebuilt!")
+
+
+@app.cli.command()
+def cache_photos():
+    """Download and thumbnail QRZ photos that are not cached locally yet"""
+    members = Member.query.options(db.joinedload(Member.photo)).filter(Member.qrz_photo_url.isnot(None)).all()
+    cached = 0
+    for member in members:
+        if member.photo and member.photo.source_url == member.qrz_photo_url:
+            continue
+        if cache_member_photo(member):
+            cached += 1
+            db.session.commit()
+    print(f"Cached {cached} member photos!")
+
+
+@app.cli.command()
+def database_settings():
+    """Show the database pool settings and effective SQLite PRAGMAs"""
+    print_database_report()
+
+
+@app.cli.command('check-query-plans')
+def check_query_plans_command():
+    """EXPLAIN the hot queries; exits non-zero if any reads a whole table"""
+    failures = 0
+    for name, plan, scanned in check_query_plans():
+        if scanned:
+            failures += 1
+        print(f"{'FULL SCAN' if scanned else 'ok':9} {name}")
+        for line in plan:
+            print(f"          {line}")
+    if failures:
+        print(f"{failures} queries scan a whole table; run `flask --app app db upgrade` "
+              "(after `flask --app app db stamp 0001_baseline` if the database has never been migrated)")
+        sys.exit(1)
+    print("All hot queries use indexes!")
+
+
+@app.cli.command()
+@click.option('--days', type=int, default=None, help='Archive entries older than this (default AUDIT_RETENTION_DAYS)')
+def archive_audit_log(days):
+    """Move old admin log entries into compressed monthly archive files (run nightly from cron)"""
+    days = app.config['AUDIT_RETENTION_DAYS'] if days is None else days
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    archived = 0
+    while True:
+        entries = (AdminLog.query.filter(AdminLog.created_at < cutoff)
+                   .order_by(AdminLog.created_at, AdminLog.id).limit(AUDIT_ARCHIVE_BATCH).all())
+        if not entries:
+            break
+        # Files are synced before the rows are deleted; a rerun skips entries already archived
+        archive_entries(app.config['AUDIT_ARCHIVE_DIR'], [entry.to_dict() for entry in entries])
+        AdminLog.query.filter(AdminLog.id.in_([entry.id for entry in entries])).delete(synchronize_session=False)
+        db.session.commit()
+        archived += len(entries)
+    print(f"Archived {archived} admin log entries older than {days} days!")
+
+
 if __name__ == '__main__':
     with app.app_context():
-        db.create_all()
+        create_database()
+        refresh_member_status()
+        if not member_search_available():
+            rebuild_member_search_index()
+        db.session.commit()
+        print_database_report()
     app.run(debug=True, host='0.0.0.0', port=1977)
@@ -0,0 +1,106 @@
+"""
+WVARA Membership Management System - Audit Log Archive
+
+Admin log entries older than the retention period are moved out of the
+database into gzip-compressed JSON Lines files, one per month
+(admin_log-YYYY-MM.jsonl.gz). Archiving is safe to repeat: entries already
+in a month's file are skipped. Searches only open the months in range.
+"""
+from datetime import datetime
+import gzip
+import json
+import os
+import re
+
+ARCHIVE_NAME = re.compile(r'^admin_log-(\d{4})-(\d{2})\.jsonl\.gz$')
+ARCHIVE_FIELDS = ('id', 'admin_call_sign', 'action', 'target_member_call_sign', 'details', 'ip_address', 'created_at')
+
+
+def archive_filename(year, month):
+    """File name of one month's archive"""
+    return f'admin_log-{year:04d}-{month:02d}.jsonl.gz'
+
+
+def read_archive(path):
+    """Entries in one archive file, in the order they were archived"""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def archive_entries(directory, entries):
+    """
+    Append entries (dicts with ARCHIVE_FIELDS, created_at a datetime) to
+    their month's archive and sync them to disk. Returns how many were new.
+    """
+    os.makedirs(directory, exist_ok=True)
+    by_month = {}
+    for entry in entries:
+        by_month.setdefault((entry['created_at'].year, entry['created_at'].month), []).append(entry)
+    
+    written = 0
+    for (year, month), month_entries in sorted(by_month.items()):
+        path = os.path.join(directory, archive_filename(year, month))
+        existing = {entry['id'] for entry in read_archive(path)} if os.path.exists(path) else set()
+        new_entries = [entry for entry in month_entries if entry['id'] not in existing]
+        if not new_entries:
+            continue
+        
+        # Each append adds a gzip member; readers see the members as one stream
+        with open(path, 'ab') as raw, gzip.GzipFile(fileobj=raw, mode='wb') as f:
+            for entry in new_entries:
+                record = {field: entry[field] for field in ARCHIVE_FIELDS}
+                record['created_at'] = entry['created_at'].isoformat()
+                f.write((json.dumps(record) + '\n').encode('utf-8'))
+        with open(path, 'rb') as raw:
+            os.fsync(raw.fileno())
+        written += len(new_entries)
+    return written
+
+
+def archive_months(directory):
+    """(year, month, path) of every archive file, oldest first"""
+    if not os.path.isdir(directory):
+        return []
+    months = []
+    for name in os.listdir(directory):
+        match = ARCHIVE_NAME.match(name)
+        if match:
+            months.append((int(match.group(1)), int(match.group(2)), os.path.join(directory, name)))
+    return sorted(months)
+
+
+def search_archive(directory, start=None, end=None, admin_call_sign=None, target_call_sign=None, text=None, limit=None):
+    """
+    Archived entries matching every given filter, newest first. start/end
+    are dates (inclusive); call signs match exactly, text anywhere in the
+    action or details.
+    """
+    text = text.lower() if text else None
+    results = []
+    for year, month, path in reversed(archive_months(directory)):
+        if start and (year, month) < (start.year, start.month):
+            break
+        if end and (year, month) > (end.year, end.month):
+            continue
+        
+        matches = []
+        for entry in read_archive(path):
+            created = datetime.fromisoformat(entry['created_at'])
+            if start and created.date() < start or end and created.date() > end:
+                continue
+            if admin_call_sign and entry['admin_call_sign'] != admin_call_sign:
+                continue
+            if target_call_sign and entry['target_member_call_sign'] != target_call_sign:
+                continue
+            if text and text not in f"{entry['action']} {entry['details'] or ''}".lower():
+                continue
+            entry['created_at'] = created
+            matches.append(entry)
+        
+        matches.sort(key=lambda entry: (entry['created_at'], entry['id']), reverse=True)
+        results.extend(matches)
+        if limit and len(results) >= limit:
+            return results[:limit]
+    return results
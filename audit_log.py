@@ -0,0 +1,94 @@
+"""
+WVARA Membership Management System - Audit Log Writer
+
+Admin log entries are queued in memory and written in batches by a
+background thread: every few seconds, as soon as a batch fills up, and
+when the process exits. Actions that must be on disk before the response
+is sent are written synchronously by the caller instead.
+"""
+import atexit
+import os
+import threading
+
+
+class AuditWriter:
+    """Queues audit entries and hands them to write(entries) in batches"""
+    
+    def __init__(self, write, flush_interval=2.0, batch_size=100, max_pending=10000):
+        self.write = write
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self._pending = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._writer_pid = None
+        self._counts = {'queued': 0, 'written': 0, 'batches': 0, 'failed_flushes': 0, 'dropped': 0}
+        atexit.register(self.flush)
+    
+    def _ensure_writer(self):
+        """Start the background writer (again after a fork, which does not copy threads)"""
+        if self._writer_pid == os.getpid():
+            return
+        with self._lock:
+            if self._writer_pid == os.getpid():
+                return
+            if self._writer_pid is not None:
+                self._pending = []  # The parent process writes its own entries
+            self._writer_pid = os.getpid()
+        threading.Thread(target=self._run, name='audit-writer', daemon=True).start()
+    
+    def add(self, entry):
+        """Queue one entry (a dict of AdminLog columns)"""
+        self._ensure_writer()
+        with self._lock:
+            self._pending.append(entry)
+            self._counts['queued'] += 1
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._wake.set()
+    
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+    
+    def flush(self):
+        """Write everything queued so far; failed batches are kept for the next flush"""
+        with self._flush_lock:
+            with self._lock:
+                entries, self._pending = self._pending, []
+            if not entries:
+                return 0
+            
+            try:
+                for start in range(0, len(entries), self.batch_size):
+                    self.write(entries[start:start + self.batch_size])
+                    with self._lock:
+                        self._counts['written'] += len(entries[start:start + self.batch_size])
+                        self._counts['batches'] += 1
+            except Exception as e:
+                print(f"Error writing audit log: {e}")
+                unwritten = entries[start:]
+                with self._lock:
+                    self._counts['failed_flushes'] += 1
+                    self._pending = unwritten + self._pending
+                    overflow = len(self._pending) - self.max_pending
+                    if overflow > 0:
+                        print(f"Audit log queue full, dropping {overflow} oldest entries")
+                        self._pending = self._pending[overflow:]
+                        self._counts['dropped'] += overflow
+                return len(entries) - len(unwritten)
+            return len(entries)
+    
+    def stats(self):
+        """Counters and the current queue length for this process"""
+        with self._lock:
+            return {
+                'flush_interval_seconds': self.flush_interval,
+                'batch_size': self.batch_size,
+                'pending': len(self._pending),
+                **self._counts,
+            }
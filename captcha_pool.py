@@ -0,0 +1,195 @@
+"""
+WVARA Membership Management System - CAPTCHA Pool
+
+CAPTCHA images are rendered ahead of time by a background thread with a
+font loaded once. Each login form gets a random token; the image is served
+by token and the expected answer stays on the server until it is checked.
+Issued CAPTCHAs live in process memory by default; the SQLite store shares
+them between worker processes.
+"""
+from PIL import Image, ImageDraw, ImageFont
+import io
+import os
+import queue
+import random
+import secrets
+import threading
+import time
+
+from shared_sqlite import SharedSQLiteFile
+
+CAPTCHA_CHARS = 'ABCDEFGHJKLMNPQRSTUVWXYZ23456789'  # Excluding confusing characters
+CAPTCHA_LENGTH = 5
+CAPTCHA_SIZE = (200, 80)
+
+FONT_PATHS = [
+    '/System/Library/Fonts/Supplemental/Arial Bold.ttf',  # macOS
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',  # Linux
+    'C:\\Windows\\Fonts\\arialbd.ttf',  # Windows
+]
+
+
+def load_captcha_font(size=48):
+    """First available system font, or Pillow's default"""
+    for font_path in FONT_PATHS:
+        try:
+            return ImageFont.truetype(font_path, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+def render_captcha(font):
+    """Random CAPTCHA text and its PNG image"""
+    captcha_text = ''.join(secrets.choice(CAPTCHA_CHARS) for _ in range(CAPTCHA_LENGTH))
+    
+    width, height = CAPTCHA_SIZE
+    image = Image.new('RGB', (width, height), color='white')
+    draw = ImageDraw.Draw(image)
+    
+    # Add background noise lines
+    for _ in range(5):
+        x1, y1 = random.randint(0, width), random.randint(0, height)
+        x2, y2 = random.randint(0, width), random.randint(0, height)
+        draw.line([(x1, y1), (x2, y2)], fill=(200, 200, 200), width=2)
+    
+    # Draw text with slight variations in position and (dark) color
+    x_start = 20
+    for i, char in enumerate(captcha_text):
+        x = x_start + (i * 32) + random.randint(-3, 3)
+        y = 15 + random.randint(-5, 5)
+        color = (random.randint(0, 100), random.randint(0, 100), random.randint(0, 100))
+        draw.text((x, y), char, fill=color, font=font)
+    
+    # Noise dots, drawn in a few batches of one shade each
+    for _ in range(4):
+        shade = random.randint(150, 200)
+        points = [(random.randint(0, width), random.randint(0, height)) for _ in range(25)]
+        draw.point(points, fill=(shade, random.randint(150, 200), random.randint(150, 200)))
+    
+    img_io = io.BytesIO()
+    image.save(img_io, 'PNG')
+    return captcha_text, img_io.getvalue()
+
+
+class MemoryCaptchaStore:
+    """Issued CAPTCHAs in a dict; each worker process has its own"""
+    
+    def __init__(self, max_issued=5000):
+        self.max_issued = max_issued
+        self._issued = {}  # token -> (answer, png, issued_at)
+        self._lock = threading.Lock()
+    
+    def put(self, token, answer, png, issued_at, ttl):
+        with self._lock:
+            if len(self._issued) >= self.max_issued:
+                self._issued = {t: entry for t, entry in self._issued.items() if issued_at - entry[2] < ttl}
+            self._issued[token] = (answer, png, issued_at)
+    
+    def get(self, token):
+        """(answer, png, issued_at) or None"""
+        with self._lock:
+            return self._issued.get(token)
+    
+    def pop(self, token):
+        """Remove and return (answer, png, issued_at), or None"""
+        with self._lock:
+            return self._issued.pop(token, None)
+
+
+class SQLiteCaptchaStore:
+    """Issued CAPTCHAs in a small SQLite file shared by every worker process"""
+    
+    PRUNE_EVERY = 500
+    
+    def __init__(self, path):
+        self.db = SharedSQLiteFile(path, '''
+            CREATE TABLE IF NOT EXISTS captcha_tokens (
+                token TEXT PRIMARY KEY,
+                answer TEXT NOT NULL,
+                png BLOB NOT NULL,
+                issued_at REAL NOT NULL
+            )
+        ''')
+        self._puts = 0
+    
+    def put(self, token, answer, png, issued_at, ttl):
+        conn = self.db.connect()
+        conn.execute('INSERT INTO captcha_tokens (token, answer, png, issued_at) VALUES (?, ?, ?, ?)',
+                     (token, answer, png, issued_at))
+        self._puts += 1
+        if self._puts % self.PRUNE_EVERY == 0:
+            conn.execute('DELETE FROM captcha_tokens WHERE issued_at < ?', (issued_at - ttl,))
+    
+    def get(self, token):
+        """(answer, png, issued_at) or None"""
+        return self.db.connect().execute(
+            'SELECT answer, png, issued_at FROM captcha_tokens WHERE token = ?', (token,)).fetchone()
+    
+    def pop(self, token):
+        """Remove and return (answer, png, issued_at), or None"""
+        with self.db.transaction() as conn:
+            entry = conn.execute('SELECT answer, png, issued_at FROM captcha_tokens WHERE token = ?', (token,)).fetchone()
+            if entry:
+                conn.execute('DELETE FROM captcha_tokens WHERE token = ?', (token,))
+        return entry
+
+
+def create_captcha_store(backend, sqlite_path=None):
+    """Issued-CAPTCHA store for the configured backend ('memory' or 'sqlite')"""
+    if backend == 'sqlite':
+        return SQLiteCaptchaStore(sqlite_path)
+    if backend == 'memory':
+        return MemoryCaptchaStore()
+    raise ValueError(f'Unknown CAPTCHA store backend: {backend}')
+
+
+class CaptchaPool:
+    """Pre-rendered CAPTCHAs handed out by token"""
+    
+    def __init__(self, size=64, ttl=600, store=None):
+        self.ttl = ttl
+        self.store = store or MemoryCaptchaStore()
+        self.font = load_captcha_font()
+        self._ready = queue.Queue(maxsize=size)
+        self._lock = threading.Lock()
+        self._filler_pid = None
+    
+    def _ensure_filler(self):
+        """Start the background renderer (again after a fork, which does not copy threads)"""
+        with self._lock:
+            if self._filler_pid == os.getpid():
+                return
+            self._filler_pid = os.getpid()
+        threading.Thread(target=self._fill, name='captcha-pool', daemon=True).start()
+    
+    def _fill(self):
+        while True:
+            self._ready.put(render_captcha(self.font))  # Blocks while the pool is full
+    
+    def issue(self):
+        """Token for a fresh CAPTCHA"""
+        self._ensure_filler()
+        try:
+            answer, png = self._ready.get_nowait()
+        except queue.Empty:
+            answer, png = render_captcha(self.font)
+        
+        token = secrets.token_urlsafe(16)
+        self.store.put(token, answer, png, time.time(), self.ttl)
+        return token
+    
+    def image(self, token):
+        """PNG for an unexpired token, or None"""
+        entry = self.store.get(token)
+        if entry is None or time.time() - entry[2] >= self.ttl:
+            return None
+        return entry[1]
+    
+    def verify(self, token, user_input):
+        """Check an answer; each token can be checked only once"""
+        entry = self.store.pop(token)
+        if entry is None or time.time() - entry[2] >= self.ttl:
+            return False
+        # Case-insensitive comparison, remove spaces
+        return user_input.upper().replace(' ', '') == entry[0]
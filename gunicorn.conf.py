@@ -0,0 +1,58 @@
+"""
+WVARA Membership Management System - Production Server Configuration
+Usage: gunicorn -c gunicorn.conf.py app:app
+
+Runs WEB_WORKERS pre-forked worker processes with WEB_THREADS threads each.
+Send SIGHUP to the master process (pid in instance/gunicorn.pid) to reload
+the code and configuration gracefully: new workers start, old workers finish
+their requests and exit.
+"""
+import os
+
+# Paths are relative to this file, not to wherever gunicorn was started
+ROOT = os.path.dirname(os.path.abspath(__file__))
+INSTANCE_DIR = os.path.join(ROOT, 'instance')
+
+# State that must be shared between workers lives in SQLite files under instance/
+os.environ.setdefault('LOGIN_RATE_LIMIT_BACKEND', 'sqlite')
+os.environ.setdefault('CAPTCHA_STORE_BACKEND', 'sqlite')
+os.makedirs(INSTANCE_DIR, exist_ok=True)
+
+chdir = ROOT
+
+bind = os.environ.get('BIND', '0.0.0.0:1977')
+workers = int(os.environ.get('WEB_WORKERS', 3))
+worker_class = 'gthread'
+# Login password checks (PASSWORD_VERIFY_WORKERS + PASSWORD_VERIFY_QUEUE) are held to at most
+# threads - 1 per worker, so a burst of logins always leaves a thread for other pages; the app
+# reads the same WEB_THREADS and shrinks the check pool to fit
+threads = int(os.environ.get('WEB_THREADS', 4))
+
+timeout = int(os.environ.get('WEB_TIMEOUT', 60))
+graceful_timeout = int(os.environ.get('WEB_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+
+# Restart each worker after this many requests to cap memory growth
+max_requests = int(os.environ.get('WEB_MAX_REQUESTS', 2000))
+max_requests_jitter = 200
+
+# Workers import the app themselves, so a reload picks up new code
+preload_app = False
+
+pidfile = os.environ.get('GUNICORN_PID', os.path.join(INSTANCE_DIR, 'gunicorn.pid'))
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = os.environ.get('GUNICORN_ERROR_LOG', '-')
+
+
+def post_worker_init(worker):
+    """Log the database settings of the engine this worker will actually use"""
+    from app import app, database_report_lines
+    with app.app_context():
+        for line in database_report_lines():
+            worker.log.info(line)
+
+
+def worker_exit(server, worker):
+    """Write any queued admin log entries before the worker goes away"""
+    from app import audit_writer
+    audit_writer.flush()
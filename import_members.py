@@ -1,126 +1,262 @@
 #!/usr/bin/env python3
 """
 CSV Member Import Script
-Usage: python import_members.py [csv_filename]
+Usage: python import_members.py [csv_filename] [--dry-run] [--json] [--batch-size N]
 
 Imports members from a CSV file into the WVARA membership database.
 CSV Format: call_sign,first_name,last_name,email,phone,address,city,state,zip,fcc_class,membership_type,join_date,emergency_name,emergency_phone,emergency_relationship
+
+The whole file is validated before anything is written. Valid rows are then
+inserted in batches inside a single transaction; a batch that fails is retried
+row by row so one bad row is reported without losing the rest.
 """
 
+import argparse
 import csv
+import json
 import sys
 from datetime import datetime
 from app import app, db
-from models import Member
+from models import Member, refresh_member_status
+from password_hashing import hash_passwords
+
+DEFAULT_BATCH_SIZE = 200
+
+REQUIRED_COLUMNS = ('call_sign', 'first_name', 'last_name', 'email', 'join_date')
+
+# CSV column -> Member attribute for fields that may be left blank
+OPTIONAL_COLUMNS = {
+    'phone': 'phone',
+    'address': 'address',
+    'city': 'city',
+    'state': 'state',
+    'zip': 'zip_code',
+    'fcc_class': 'fcc_license_class',
+    'emergency_name': 'emergency_contact_name',
+    'emergency_phone': 'emergency_contact_phone',
+    'emergency_relationship': 'emergency_contact_relationship',
+}
+
 
-def import_members(csv_filename='sample_import.csv'):
-    """Import members from CSV file"""
+def clean(row, column):
+    """Stripped value of a CSV cell, or None if blank or missing"""
+    value = (row.get(column) or '').strip()
+    return value or None
+
+
+def validate_rows(reader, existing_call_signs, existing_emails, results):
+    """
+    Check every row against the database and the rest of the file.
+    
+    Returns (row_num, fields) for each importable row; skipped and invalid
+    rows are appended to results.
+    """
+    seen_call_signs = set(existing_call_signs)
+    seen_emails = set(existing_emails)
+    valid = []
+    
+    for row_num, row in enumerate(reader, start=2):  # Start at 2 (after header)
+        call_sign = (clean(row, 'call_sign') or '').upper()
+        email = clean(row, 'email')
+        
+        missing = [column for column in REQUIRED_COLUMNS if not clean(row, column)]
+        if missing:
+            results.append(row_result(row_num, call_sign, 'error', f"missing {', '.join(missing)}"))
+            continue
+        
+        if call_sign in seen_call_signs:
+            reason = 'already exists' if call_sign in existing_call_signs else 'duplicate call sign in file'
+            results.append(row_result(row_num, call_sign, 'skipped', reason))
+            continue
+        
+        if email in seen_emails:
+            results.append(row_result(row_num, call_sign, 'skipped', f'email {email} already in use'))
+            continue
+        
+        try:
+            join_date = datetime.strptime(row['join_date'].strip(), '%Y-%m-%d').date()
+        except ValueError:
+            results.append(row_result(row_num, call_sign, 'error', f"invalid date format: {row['join_date']}"))
+            continue
+        
+        fields = {
+            'call_sign': call_sign,
+            'first_name': clean(row, 'first_name'),
+            'last_name': clean(row, 'last_name'),
+            'email': email,
+            'membership_type': clean(row, 'membership_type') or 'Individual',
+            'join_date': join_date,
+        }
+        for column, attribute in OPTIONAL_COLUMNS.items():
+            fields[attribute] = clean(row, column)
+        
+        seen_call_signs.add(call_sign)
+        seen_emails.add(email)
+        valid.append((row_num, fields))
+    
+    return valid
+
+
+def row_result(row_num, call_sign, status, message=None):
+    """One entry of the import report"""
+    return {'row': row_num, 'call_sign': call_sign, 'status': status, 'message': message}
+
+
+def build_member(fields):
+    """New active, non-admin member with a temporary password"""
+    return Member(is_active=True, is_admin=False, password_is_temporary=True, **fields)
+
+
+def insert_batch(batch, results):
+    """
+    Insert one batch under a savepoint, falling back to one savepoint per
+    row if the batch fails. Returns the ids of the inserted members.
+    """
+    members = [build_member(fields) for _, fields in batch]
+    try:
+        with db.session.begin_nested():
+            db.session.add_all(members)
+    except Exception:
+        members = []
+        for row_num, fields in batch:
+            member = build_member(fields)
+            try:
+                with db.session.begin_nested():
+                    db.session.add(member)
+            except Exception as e:
+                results.append(row_result(row_num, fields['call_sign'], 'error', str(getattr(e, 'orig', e))))
+                continue
+            members.append(member)
+        inserted = {member.call_sign for member in members}
+        batch = [(row_num, fields) for row_num, fields in batch if fields['call_sign'] in inserted]
+    
+    for row_num, fields in batch:
+        results.append(row_result(row_num, fields['call_sign'], 'imported',
+                                  f"{fields['first_name']} {fields['last_name']}"))
+    return [member.id for member in members]
+
+
+def print_row(result):
+    """Human-readable line for one row of the report"""
+    symbol = {'imported': '✓', 'valid': '✓', 'skipped': '⊘', 'error': '✗'}[result['status']]
+    if result['status'] in ('imported', 'valid'):
+        print(f"{symbol} Row {result['row']}: {result['call_sign']} - {result['message']} - {result['status'].upper()}")
+    else:
+        print(f"{symbol} Row {result['row']}: {result['call_sign']} - {result['status'].upper()} ({result['message']})")
+
+
+def import_members(csv_filename='sample_import.csv', dry_run=False, batch_size=DEFAULT_BATCH_SIZE, as_json=False):
+    """Import members from CSV file; returns the summary dict"""
     
     with app.app_context():
-        imported = 0
-        skipped = 0
-        errors = 0
+        results = []
+        summary = {'file': csv_filename, 'dry_run': dry_run}
         
-        print(f"\n{'='*60}")
-        print(f"WVARA Member Import")
-        print(f"{'='*60}\n")
-        print(f"Reading from: {csv_filename}\n")
+        if not as_json:
+            print(f"\n{'='*60}")
+            print(f"WVARA Member Import{' (DRY RUN)' if dry_run else ''}")
+            print(f"{'='*60}\n")
+            print(f"Reading from: {csv_filename}\n")
+        
+        existing_call_signs = {call_sign for (call_sign,) in db.session.query(Member.call_sign)}
+        existing_emails = {email for (email,) in db.session.query(Member.email)}
         
         try:
-            with open(csv_filename, 'r') as csvfile:
-                reader = csv.DictReader(csvfile)
-                
-                for row_num, row in enumerate(reader, start=2):  # Start at 2 (after header)
-                    call_sign = row['call_sign'].strip().upper()
-                    
-                    # Check if member already exists
-                    existing = Member.query.filter_by(call_sign=call_sign).first()
-                    if existing:
-                        print(f"⊘ Row {row_num}: {call_sign} - SKIPPED (already exists)")
-                        skipped += 1
-                        continue
-                    
-                    # Check if email already exists
-                    email = row['email'].strip()
-                    existing_email = Member.query.filter_by(email=email).first()
-                    if existing_email:
-                        print(f"⊘ Row {row_num}: {call_sign} - SKIPPED (email {email} already in use)")
-                        skipped += 1
-                        continue
-                    
-                    # Parse join date
-                    try:
-                        join_date = datetime.strptime(row['join_date'].strip(), '%Y-%m-%d').date()
-                    except ValueError:
-                        print(f"✗ Row {row_num}: {call_sign} - ERROR (invalid date format: {row['join_date']})")
-                        errors += 1
-                        continue
-                    
-                    # Create new member
-                    try:
-                        new_member = Member(
-                            call_sign=call_sign,
-                            first_name=row['first_name'].strip(),
-                            last_name=row['last_name'].strip(),
-                            email=email,
-                            phone=row['phone'].strip() if row['phone'].strip() else None,
-                            address=row['address'].strip() if row['address'].strip() else None,
-                            city=row['city'].strip() if row['city'].strip() else None,
-                            state=row['state'].strip() if row['state'].strip() else None,
-                            zip_code=row['zip'].strip() if row['zip'].strip() else None,
-                            fcc_license_class=row['fcc_class'].strip() if row['fcc_class'].strip() else None,
-                            membership_type=row['membership_type'].strip() if row['membership_type'].strip() else 'Individual',
-                            join_date=join_date,
-                            emergency_contact_name=row['emergency_name'].strip() if row['emergency_name'].strip() else None,
-                            emergency_contact_phone=row['emergency_phone'].strip() if row['emergency_phone'].strip() else None,
-                            emergency_contact_relationship=row['emergency_relationship'].strip() if row['emergency_relationship'].strip() else None,
-                            is_active=True,
-                            is_admin=False
-                        )
-                        
-                        # Set initial password to call sign (temporary)
-                        new_member.set_password(call_sign)
-                        new_member.password_is_temporary = True
-                        
-                        db.session.add(new_member)
-                        db.session.commit()
-                        
-                        print(f"✓ Row {row_num}: {call_sign} - {row['first_name']} {row['last_name']} - IMPORTED")
-                        imported += 1
-                        
-                    except Exception as e:
-                        db.session.rollback()
-                        print(f"✗ Row {row_num}: {call_sign} - ERROR ({str(e)})")
-                        errors += 1
-                        continue
+            with open(csv_filename, 'r', newline='') as csvfile:
+                valid = validate_rows(csv.DictReader(csvfile), existing_call_signs, existing_emails, results)
         
         except FileNotFoundError:
-            print(f"✗ ERROR: File '{csv_filename}' not found!")
-            print(f"\nMake sure the CSV file is in the same directory as this script.")
-            return
+            summary['error'] = f"File '{csv_filename}' not found"
+            if not as_json:
+                print(f"✗ ERROR: File '{csv_filename}' not found!")
+                print(f"\nMake sure the CSV file is in the same directory as this script.")
+            return summary
         
         except Exception as e:
-            print(f"✗ ERROR: {str(e)}")
-            return
+            summary['error'] = str(e)
+            if not as_json:
+                print(f"✗ ERROR: {str(e)}")
+            return summary
+        
+        if dry_run:
+            results.extend(row_result(row_num, fields['call_sign'], 'valid',
+                                      f"{fields['first_name']} {fields['last_name']}")
+                           for row_num, fields in valid)
+        else:
+            # Initial password is the call sign; hash them all across every core before
+            # taking the write lock
+            password_hashes = hash_passwords(fields['call_sign'] for _, fields in valid)
+            for (_, fields), password_hash in zip(valid, password_hashes):
+                fields['password_hash'] = password_hash
+            
+            # pysqlite does not BEGIN before a SAVEPOINT, so open the transaction (and take
+            # the write lock) explicitly to keep every batch inside one transaction
+            db.session.execute(db.text('BEGIN IMMEDIATE'))
+            imported_ids = []
+            for start in range(0, len(valid), batch_size):
+                imported_ids.extend(insert_batch(valid[start:start + batch_size], results))
+            
+            # Create member_status rows for everyone imported
+            refresh_member_status(imported_ids)
+            db.session.commit()
+        
+        results.sort(key=lambda result: result['row'])
+        counts = {status: 0 for status in ('imported', 'valid', 'skipped', 'error')}
+        for result in results:
+            counts[result['status']] += 1
+        
+        summary.update({
+            'imported': counts['imported'],
+            'would_import': counts['valid'],
+            'skipped': counts['skipped'],
+            'errors': counts['error'],
+            'rows': results,
+        })
+        
+        if as_json:
+            return summary
+        
+        for result in results:
+            print_row(result)
         
         # Print summary
         print(f"\n{'='*60}")
         print(f"Import Summary")
         print(f"{'='*60}")
-        print(f"✓ Successfully imported: {imported}")
-        print(f"⊘ Skipped (duplicates):  {skipped}")
-        print(f"✗ Errors:                {errors}")
+        if dry_run:
+            print(f"✓ Would import:          {counts['valid']}")
+        else:
+            print(f"✓ Successfully imported: {counts['imported']}")
+        print(f"⊘ Skipped (duplicates):  {counts['skipped']}")
+        print(f"✗ Errors:                {counts['error']}")
         print(f"{'='*60}\n")
         
-        if imported > 0:
+        if dry_run:
+            print(f"Dry run only - no changes were made to the database.\n")
+        elif counts['imported'] > 0:
             print(f"Initial Passwords:")
             print(f"  All imported members have their call sign as password")
             print(f"  (e.g., W6ABC password is 'W6ABC')")
             print(f"  Members MUST change password on first login.\n")
+        
+        return summary
 
 
 if __name__ == '__main__':
-    # Get CSV filename from command line or use default
-    csv_file = sys.argv[1] if len(sys.argv) > 1 else 'sample_import.csv'
+    parser = argparse.ArgumentParser(description='Import members from a CSV file')
+    parser.add_argument('csv_file', nargs='?', default='sample_import.csv',
+                        help='CSV file to import (default: sample_import.csv)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='validate the file and report what would be imported without writing')
+    parser.add_argument('--json', action='store_true',
+                        help='print only a JSON summary of the import')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'rows inserted per batch (default: {DEFAULT_BATCH_SIZE})')
+    args = parser.parse_args()
+    
+    summary = import_members(args.csv_file, dry_run=args.dry_run, batch_size=args.batch_size, as_json=args.json)
+    
+    if args.json:
+        print(json.dumps(summary, indent=2))
     
-    import_members(csv_file)
+    sys.exit(1 if summary.get('error') or summary.get('errors') else 0)
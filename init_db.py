@@ -2,8 +2,9 @@
 Initialize WVARA Membership Database with Sample Data
 Run this after first installation to populate the database with initial members
 """
-from app import app, db
-from models import Member, DuesPayment, RoleHistory
+from app import app, db, create_database
+from models import Member, DuesPayment, RoleHistory, refresh_member_status
+from password_hashing import hash_passwords
 from datetime import date, datetime
 import csv
 
@@ -11,7 +12,7 @@ def init_database():
     """Initialize database with initial member data"""
     with app.app_context():
         # Create all tables
-        db.create_all()
+        create_database()
         print("✓ Database tables created")
         
         # Check if data already exists
@@ -42,9 +43,9 @@ def init_database():
             emergency_contact_phone='(408) 555-5678',
             emergency_contact_relationship='Spouse'
         )
-        sal.set_password('W6SAL')  # Initial password same as call sign
-        sal.password_is_temporary = True
+        sal.password_is_temporary = True  # Initial password same as call sign
         db.session.add(sal)
+        new_members = [sal]
         print(f"  ✓ Created {sal.call_sign} - Admin")
         
       
@@ -100,11 +101,15 @@ def init_database():
                 emergency_contact_phone='(408) 555-9999',
                 emergency_contact_relationship='Family'
             )
-            member.set_password(member_data['call_sign'])
             member.password_is_temporary = True
             db.session.add(member)
+            new_members.append(member)
             print(f"  ✓ Created {member.call_sign}")
         
+        # Every initial password is the member's call sign
+        for member, password_hash in zip(new_members, hash_passwords(m.call_sign for m in new_members)):
+            member.password_hash = password_hash
+        
         db.session.commit()
         print("\n✓ Member data created successfully")
         
@@ -141,6 +146,10 @@ def init_database():
         db.session.commit()
         print(f"✓ Dues payments created for {current_year}")
         
+        refresh_member_status()
+        db.session.commit()
+        print("✓ Member status computed")
+        
         print("\n" + "="*60)
         print("DATABASE INITIALIZATION COMPLETE!")
         print("="*60)
@@ -164,11 +173,13 @@ def load_members_from_csv(csv_file):
         with open(csv_file, 'r') as file:
             reader = csv.DictReader(file)
             count = 0
+            new_members = []
+            added_call_signs = set()
             
             for row in reader:
                 # Check if member already exists
                 existing = Member.query.filter_by(call_sign=row['call_sign'].upper()).first()
-                if existing:
+                if existing or row['call_sign'].upper().strip() in added_call_signs:
                     print(f"  ⚠ Skipping {row['call_sign']} - already exists")
                     continue
                 
@@ -198,14 +209,20 @@ def load_members_from_csv(csv_file):
                     emergency_contact_relationship=row.get('emergency_relationship', '')
                 )
                 
-                # Set initial password to call sign
-                member.set_password(row['call_sign'].upper())
+                # Initial password is the call sign, hashed in bulk below
                 member.password_is_temporary = True
-                
-                db.session.add(member)
+                new_members.append(member)
+                added_call_signs.add(member.call_sign)
                 count += 1
                 print(f"  ✓ Added {member.call_sign} - {member.get_full_name()}")
             
+            for member, password_hash in zip(new_members, hash_passwords(m.call_sign for m in new_members)):
+                member.password_hash = password_hash
+            
+            # Added only once hashed so the duplicate check above never flushes a member without one
+            db.session.add_all(new_members)
+            db.session.commit()
+            refresh_member_status()
             db.session.commit()
             print(f"\n✓ Successfully imported {count} members")
 
@@ -0,0 +1,69 @@
+"""
+WVARA Membership Management System - Member Prefix Index
+
+In-memory prefix index over call signs and names, used by the member
+picker autocomplete. It is rebuilt from a single query whenever the
+member version in the database changes.
+"""
+from bisect import bisect_left
+import threading
+
+
+class MemberPrefixIndex:
+    """Sorted (key, member id) pairs searched by prefix with bisect"""
+    
+    def __init__(self):
+        self.version = None
+        self._keys = []
+        self._ids = []
+        self._members = {}
+        self._lock = threading.Lock()
+    
+    def rebuild(self, rows, version):
+        """Rebuild from (id, call_sign, first_name, last_name) rows"""
+        entries = []
+        members = {}
+        for member_id, call_sign, first_name, last_name in rows:
+            members[member_id] = {
+                'id': member_id,
+                'call_sign': call_sign,
+                'name': f'{first_name} {last_name}'
+            }
+            # Rank 0 = call sign match, 1 = name match
+            entries.append((call_sign.lower(), 0, member_id))
+            for name in (first_name, last_name):
+                if name:
+                    entries.append((name.lower(), 1, member_id))
+        entries.sort()
+        
+        with self._lock:
+            self._keys = [key for key, _, _ in entries]
+            self._ids = [(rank, member_id) for _, rank, member_id in entries]
+            self._members = members
+            self.version = version
+    
+    def search(self, prefix, limit=10):
+        """Return up to limit members whose call sign or name starts with prefix"""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        
+        with self._lock:
+            keys, ids, members = self._keys, self._ids, self._members
+        
+        matches = []
+        position = bisect_left(keys, prefix)
+        while position < len(keys) and keys[position].startswith(prefix):
+            rank, member_id = ids[position]
+            matches.append((rank, members[member_id]['call_sign'], member_id))
+            position += 1
+        
+        results = []
+        seen = set()
+        for _, _, member_id in sorted(matches):
+            if member_id not in seen:
+                seen.add(member_id)
+                results.append(members[member_id])
+                if len(results) == limit:
+                    break
+        return results
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Meeting Table Migration Script
+Usage: python migrate_meetings.py
+
+The meetings change is now the 0004_meetings migration; this script is
+kept for older upgrade instructions. It marks a database that has never
+been migrated as 0001_baseline and then runs `flask --app app db upgrade`.
+"""
+from flask_migrate import stamp, upgrade
+from app import app, db
+
+
+def migrate_meetings():
+    """Bring the database up to date through the migrations"""
+    with app.app_context():
+        inspector = db.inspect(db.engine)
+        if inspector.has_table('members') and not inspector.has_table('alembic_version'):
+            stamp(revision='0001_baseline')
+            print("✓ Marked the database as 0001_baseline")
+        
+        upgrade()
+        print("\nMeeting migration complete!\n")
+
+
+if __name__ == '__main__':
+    migrate_meetings()
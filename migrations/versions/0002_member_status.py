@@ -0,0 +1,46 @@
+"""Persisted member status
+
+Revision ID: 0002_member_status
+Revises: 0001_baseline
+Create Date: 2026-10-16 23:36:00.000000
+
+The table starts empty; `flask --app app rebuild-member-status` fills it.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_member_status'
+down_revision = '0001_baseline'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table('member_status'):
+        return  # Created by db.create_all() before migrations existed
+
+    op.create_table('member_status',
+    sa.Column('member_id', sa.Integer(), nullable=False),
+    sa.Column('last_dues_year', sa.Integer(), nullable=True),
+    sa.Column('last_attendance_date', sa.Date(), nullable=True),
+    sa.Column('dues_current', sa.Boolean(), nullable=False),
+    sa.Column('recent_activity', sa.Boolean(), nullable=False),
+    sa.Column('is_truly_active', sa.Boolean(), nullable=False),
+    sa.Column('status_category', sa.String(length=20), nullable=False),
+    sa.Column('computed_on', sa.Date(), nullable=False),
+    sa.ForeignKeyConstraint(['member_id'], ['members.id'], ),
+    sa.PrimaryKeyConstraint('member_id')
+    )
+    with op.batch_alter_table('member_status', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_member_status_is_truly_active'), ['is_truly_active'], unique=False)
+        batch_op.create_index(batch_op.f('ix_member_status_status_category'), ['status_category'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('member_status', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_member_status_status_category'))
+        batch_op.drop_index(batch_op.f('ix_member_status_is_truly_active'))
+
+    op.drop_table('member_status')
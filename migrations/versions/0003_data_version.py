@@ -0,0 +1,37 @@
+"""Data version counters for the report cache and member picker
+
+Revision ID: 0003_data_version
+Revises: 0002_member_status
+Create Date: 2026-10-16 23:37:00.000000
+
+A database created while the table had only the report counter gets the
+member_version column.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_data_version'
+down_revision = '0002_member_status'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('data_version'):
+        op.create_table('data_version',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('member_version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+    elif 'member_version' not in {column['name'] for column in inspector.get_columns('data_version')}:
+        with op.batch_alter_table('data_version', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('member_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    op.drop_table('data_version')
@@ -0,0 +1,123 @@
+"""Meetings table, self check-in and one attendance row per member per meeting
+
+Revision ID: 0004_meetings
+Revises: 0003_data_version
+Create Date: 2026-10-16 23:38:00.000000
+
+Does what migrate_meetings.py used to do, and finishes the job on databases
+where that script already ran:
+- each distinct (date, event type, event name) in meeting_attendance
+  becomes one meeting, and its attendance rows are linked by meeting_id
+- duplicate rows for a member at one meeting are removed, keeping the
+  earliest
+- meeting_attendance is rebuilt with meeting_id NOT NULL, the
+  (meeting_id, member_id) unique constraint and without the event columns
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_meetings'
+down_revision = '0003_data_version'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if not inspector.has_table('meetings'):
+        op.create_table('meetings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('meeting_date', sa.Date(), nullable=False),
+        sa.Column('event_type', sa.String(length=20), nullable=True),
+        sa.Column('event_name', sa.String(length=200), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('recorded_by', sa.String(length=10), nullable=True),
+        sa.Column('checkin_token', sa.String(length=32), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('checkin_token')
+        )
+        with op.batch_alter_table('meetings', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_meetings_meeting_date'), ['meeting_date'], unique=False)
+    elif 'checkin_token' not in {column['name'] for column in inspector.get_columns('meetings')}:
+        with op.batch_alter_table('meetings', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('checkin_token', sa.String(length=32), nullable=True))
+            batch_op.create_unique_constraint('uq_meetings_checkin_token', ['checkin_token'])
+
+    columns = {column['name'] for column in inspector.get_columns('meeting_attendance')}
+    if 'meeting_id' not in columns:
+        op.add_column('meeting_attendance', sa.Column('meeting_id', sa.Integer(), nullable=True))
+
+    if 'event_type' in columns:
+        # One meeting per distinct date/type/name that is not linked yet
+        bind.execute(sa.text('''
+            INSERT INTO meetings (meeting_date, event_type, event_name, created_at, recorded_by)
+            SELECT meeting_date, event_type, event_name, MIN(created_at), MIN(recorded_by)
+            FROM meeting_attendance
+            WHERE meeting_id IS NULL
+            GROUP BY meeting_date, event_type, event_name
+        '''))
+        bind.execute(sa.text('''
+            UPDATE meeting_attendance SET meeting_id = (
+                SELECT meetings.id FROM meetings
+                WHERE meetings.meeting_date = meeting_attendance.meeting_date
+                  AND meetings.event_type IS meeting_attendance.event_type
+                  AND meetings.event_name IS meeting_attendance.event_name
+                ORDER BY meetings.id
+                LIMIT 1
+            )
+            WHERE meeting_id IS NULL
+        '''))
+
+    # Keep the earliest row where a member was recorded twice for one meeting
+    bind.execute(sa.text('''
+        DELETE FROM meeting_attendance
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM meeting_attendance GROUP BY meeting_id, member_id
+        )
+    '''))
+
+    indexes = {index['name'] for index in inspector.get_indexes('meeting_attendance')}
+    references_meetings = any(
+        foreign_key['referred_table'] == 'meetings'
+        for foreign_key in inspector.get_foreign_keys('meeting_attendance')
+    )
+    with op.batch_alter_table('meeting_attendance', schema=None, recreate='always') as batch_op:
+        batch_op.alter_column('meeting_id', existing_type=sa.Integer(), nullable=False)
+        for column in ('event_type', 'event_name'):
+            if column in columns:
+                batch_op.drop_column(column)
+        # The old migrate_meetings.py made these unique indexes rather than a constraint
+        if 'uq_meeting_attendance_meeting_member' in indexes:
+            batch_op.drop_index('uq_meeting_attendance_meeting_member')
+        batch_op.create_unique_constraint('uq_meeting_attendance_meeting_member', ['meeting_id', 'member_id'])
+        if not references_meetings:
+            batch_op.create_foreign_key('fk_meeting_attendance_meeting_id', 'meetings', ['meeting_id'], ['id'])
+        if 'ix_meeting_attendance_meeting_id' not in indexes:
+            batch_op.create_index(batch_op.f('ix_meeting_attendance_meeting_id'), ['meeting_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('meeting_attendance', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('event_type', sa.String(length=20), nullable=True))
+        batch_op.add_column(sa.Column('event_name', sa.String(length=200), nullable=True))
+
+    op.get_bind().execute(sa.text('''
+        UPDATE meeting_attendance SET
+            event_type = (SELECT event_type FROM meetings WHERE meetings.id = meeting_attendance.meeting_id),
+            event_name = (SELECT event_name FROM meetings WHERE meetings.id = meeting_attendance.meeting_id)
+    '''))
+
+    with op.batch_alter_table('meeting_attendance', schema=None, recreate='always') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_meeting_attendance_meeting_id'))
+        batch_op.drop_constraint('uq_meeting_attendance_meeting_member', type_='unique')
+        batch_op.drop_column('meeting_id')
+
+    with op.batch_alter_table('meetings', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_meetings_meeting_date'))
+
+    op.drop_table('meetings')
@@ -0,0 +1,40 @@
+"""Locally cached member photo thumbnails
+
+Revision ID: 0005_member_photos
+Revises: 0004_meetings
+Create Date: 2026-10-16 23:39:00.000000
+
+The table starts empty; `flask --app app cache-photos` fills it.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_member_photos'
+down_revision = '0004_meetings'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table('member_photos'):
+        return  # Created by db.create_all() before migrations existed
+
+    op.create_table('member_photos',
+    sa.Column('member_id', sa.Integer(), nullable=False),
+    sa.Column('source_url', sa.String(length=500), nullable=False),
+    sa.Column('content_hash', sa.String(length=16), nullable=False),
+    sa.Column('cached_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['member_id'], ['members.id'], ),
+    sa.PrimaryKeyConstraint('member_id')
+    )
+    with op.batch_alter_table('member_photos', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_member_photos_content_hash'), ['content_hash'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('member_photos', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_member_photos_content_hash'))
+
+    op.drop_table('member_photos')
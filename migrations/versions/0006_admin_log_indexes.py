@@ -0,0 +1,30 @@
+"""Index the admin log for the audit view and the archive job
+
+Revision ID: 0006_admin_log_indexes
+Revises: 0005_member_photos
+Create Date: 2026-10-16 23:40:00.000000
+
+Databases that already got the indexes when the app started keep them.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_admin_log_indexes'
+down_revision = '0005_member_photos'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('admin_log', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_admin_log_admin_call_sign'), ['admin_call_sign'], unique=False, if_not_exists=True)
+        batch_op.create_index(batch_op.f('ix_admin_log_created_at'), ['created_at'], unique=False, if_not_exists=True)
+        batch_op.create_index(batch_op.f('ix_admin_log_target_member_call_sign'), ['target_member_call_sign'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    with op.batch_alter_table('admin_log', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_admin_log_target_member_call_sign'))
+        batch_op.drop_index(batch_op.f('ix_admin_log_created_at'))
+        batch_op.drop_index(batch_op.f('ix_admin_log_admin_call_sign'))
@@ -0,0 +1,49 @@
+"""Index the columns used by status, attendance, role and import queries
+
+Revision ID: 0007_hot_query_indexes
+Revises: 0006_admin_log_indexes
+Create Date: 2026-10-16 23:50:00.000000
+
+Adds one dues payment per member per year as a unique index. The upgrade
+stops and lists the payments to fix if a member already has two for the
+same year.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_hot_query_indexes'
+down_revision = '0006_admin_log_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    duplicates = op.get_bind().execute(sa.text('''
+        SELECT members.call_sign, dues_payments.year, COUNT(*)
+        FROM dues_payments JOIN members ON members.id = dues_payments.member_id
+        GROUP BY dues_payments.member_id, dues_payments.year
+        HAVING COUNT(*) > 1
+    ''')).fetchall()
+    if duplicates:
+        listing = ', '.join(f'{call_sign} {year} ({count} payments)' for call_sign, year, count in duplicates)
+        raise RuntimeError(f'Remove duplicate dues payments before upgrading: {listing}')
+
+    op.create_index('uq_dues_payments_member_year', 'dues_payments', ['member_id', 'year'], unique=True)
+    op.create_index(op.f('ix_dues_payments_year'), 'dues_payments', ['year'], unique=False)
+    op.create_index('ix_meeting_attendance_member_date', 'meeting_attendance', ['member_id', 'meeting_date'], unique=False)
+    op.create_index(op.f('ix_meeting_attendance_meeting_date'), 'meeting_attendance', ['meeting_date'], unique=False)
+    op.create_index('ix_role_history_current_start', 'role_history', ['is_current', 'start_date'], unique=False)
+    op.create_index(op.f('ix_role_history_member_id'), 'role_history', ['member_id'], unique=False)
+    op.create_index(op.f('ix_members_email'), 'members', ['email'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_members_email'), table_name='members')
+    op.drop_index(op.f('ix_role_history_member_id'), table_name='role_history')
+    op.drop_index('ix_role_history_current_start', table_name='role_history')
+    op.drop_index(op.f('ix_meeting_attendance_meeting_date'), table_name='meeting_attendance')
+    op.drop_index('ix_meeting_attendance_member_date', table_name='meeting_attendance')
+    op.drop_index(op.f('ix_dues_payments_year'), table_name='dues_payments')
+    op.drop_index('uq_dues_payments_member_year', table_name='dues_payments')
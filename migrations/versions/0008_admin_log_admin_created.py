@@ -0,0 +1,30 @@
+"""Index the admin log by admin and time for the audit view
+
+Revision ID: 0008_admin_log_admin_created
+Revises: 0007_hot_query_indexes
+Create Date: 2026-10-17 10:15:00.000000
+
+One admin's entries newest first come straight off (admin_call_sign,
+created_at) without a sort. The admin_call_sign index is a prefix of it
+and is dropped.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0008_admin_log_admin_created'
+down_revision = '0007_hot_query_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('admin_log', schema=None) as batch_op:
+        batch_op.create_index('ix_admin_log_admin_created', ['admin_call_sign', 'created_at'], unique=False)
+        batch_op.drop_index(batch_op.f('ix_admin_log_admin_call_sign'))
+
+
+def downgrade():
+    with op.batch_alter_table('admin_log', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_admin_log_admin_call_sign'), ['admin_call_sign'], unique=False)
+        batch_op.drop_index('ix_admin_log_admin_created')
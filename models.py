@@ -2,11 +2,30 @@
 WVARA Membership Management System - Database Models
 """
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from werkzeug.security import generate_password_hash, check_password_hash
+from photo_cache import photo_filename
 from datetime import datetime, date, timedelta
+from collections import namedtuple
+from itertools import chain
+import re
 
 db = SQLAlchemy()
 
+# Members stay "current" on the previous year's dues through the end of February
+DUES_GRACE_END_MONTH = 2
+
+# Window used to decide whether a member has recent activity
+RECENT_ACTIVITY_MONTHS = 6
+
+# Status categories stored in member_status (match the /admin/members filter values)
+STATUS_ACTIVE = 'active'      # Dues paid + recent activity
+STATUS_INACTIVE = 'inactive'  # Dues paid, no recent activity
+STATUS_EXPIRED = 'expired'    # Dues not current
+STATUS_DISABLED = 'disabled'  # Account deactivated
+
 
 class Member(db.Model):
     """Core member information"""
@@ -16,7 +35,7 @@ class Member(db.Model):
     call_sign = db.Column(db.String(10), unique=True, nullable=False, index=True)
     first_name = db.Column(db.String(50), nullable=False)
     last_name = db.Column(db.String(50), nullable=False)
-    email = db.Column(db.String(120), nullable=False)
+    email = db.Column(db.String(120), nullable=False, index=True)
     phone = db.Column(db.String(20))
     address = db.Column(db.String(200))
     city = db.Column(db.String(100))
@@ -53,6 +72,8 @@ class Member(db.Model):
     dues_payments = db.relationship('DuesPayment', backref='member', lazy=True, cascade='all, delete-orphan')
     role_history = db.relationship('RoleHistory', backref='member', lazy=True, cascade='all, delete-orphan')
     attendance = db.relationship('MeetingAttendance', backref='member', lazy=True, cascade='all, delete-orphan')
+    status_record = db.relationship('MemberStatusRecord', backref='member', uselist=False, lazy=True, cascade='all, delete-orphan')
+    photo = db.relationship('MemberPhoto', backref='member', uselist=False, lazy=True, cascade='all, delete-orphan')
     
     def set_password(self, password):
         """Hash and set password"""
@@ -76,21 +97,10 @@ class Member(db.Model):
         return payment
     
     def is_dues_current(self):
-        """Check if dues are paid for current year"""
-        current_year = date.today().year
-        current_date = date.today()
-        
-        # Grace period: through February of following year
-        grace_end = date(current_year, 2, 28)
-        if current_date.year > current_year and current_date <= grace_end:
-            # Check previous year during grace period
-            year_to_check = current_year - 1
-        else:
-            year_to_check = current_year
-        
-        payment = DuesPayment.query.filter_by(
-            member_id=self.id,
-            year=year_to_check
+        """Check if dues are paid for current year (or last year during the grace period)"""
+        payment = DuesPayment.query.filter(
+            DuesPayment.member_id == self.id,
+            DuesPayment.year.in_(current_dues_years())
         ).first()
         
         return payment is not None
@@ -109,9 +119,9 @@ class Member(db.Model):
         else:
             return f"{months} month{'s' if months != 1 else ''}"
     
-    def has_recent_activity(self, months=6):
+    def has_recent_activity(self, months=RECENT_ACTIVITY_MONTHS):
         """Check if member has attended any events in the last X months"""
-        cutoff_date = date.today() - timedelta(days=months * 30)
+        cutoff_date = activity_cutoff_date(months=months)
         recent_attendance = MeetingAttendance.query.filter_by(
             member_id=self.id
         ).filter(MeetingAttendance.meeting_date >= cutoff_date).first()
@@ -125,13 +135,157 @@ class Member(db.Model):
         return f'<Member {self.call_sign} - {self.get_full_name()}>'
 
 
+def current_dues_years(today=None):
+    """Return the dues years that count as paid-up on the given date"""
+    today = today or date.today()
+    
+    # Grace period: last year's payment still counts through February
+    if today.month <= DUES_GRACE_END_MONTH:
+        return (today.year - 1, today.year)
+    return (today.year,)
+
+
+def activity_cutoff_date(today=None, months=RECENT_ACTIVITY_MONTHS):
+    """Return the earliest attendance date that counts as recent activity"""
+    today = today or date.today()
+    return today - timedelta(days=months * 30)
+
+
+MemberStatus = namedtuple('MemberStatus', ['dues_current', 'recent_activity', 'truly_active'])
+NO_STATUS = MemberStatus(False, False, False)
+
+
+class MemberStatusMap(dict):
+    """Member id -> MemberStatus; members with no dues or attendance get NO_STATUS"""
+    
+    def __missing__(self, member_id):
+        return NO_STATUS
+
+
+MemberStatusQueries = namedtuple('MemberStatusQueries', ['paid', 'recently_active', 'last_dues_years', 'last_attendance_dates'])
+
+
+def member_status_queries(today=None, months=RECENT_ACTIVITY_MONTHS, member_ids=None):
+    """
+    The queries behind member status, limited to member_ids if given.
+    
+    paid and recently_active return distinct member ids; last_dues_years and
+    last_attendance_dates return (member id, latest value) per member.
+    `flask check-query-plans` explains these same queries.
+    """
+    paid = db.session.query(DuesPayment.member_id).filter(
+        DuesPayment.year.in_(current_dues_years(today))
+    ).distinct()
+    recently_active = db.session.query(MeetingAttendance.member_id).filter(
+        MeetingAttendance.meeting_date >= activity_cutoff_date(today, months)
+    ).distinct()
+    last_dues_years = db.session.query(
+        DuesPayment.member_id, db.func.max(DuesPayment.year)
+    ).group_by(DuesPayment.member_id)
+    last_attendance_dates = db.session.query(
+        MeetingAttendance.member_id, db.func.max(MeetingAttendance.meeting_date)
+    ).group_by(MeetingAttendance.member_id)
+    
+    if member_ids is not None:
+        paid = paid.filter(DuesPayment.member_id.in_(member_ids))
+        recently_active = recently_active.filter(MeetingAttendance.member_id.in_(member_ids))
+        last_dues_years = last_dues_years.filter(DuesPayment.member_id.in_(member_ids))
+        last_attendance_dates = last_attendance_dates.filter(MeetingAttendance.member_id.in_(member_ids))
+    return MemberStatusQueries(paid, recently_active, last_dues_years, last_attendance_dates)
+
+
+def compute_member_statuses(today=None, months=RECENT_ACTIVITY_MONTHS, member_ids=None):
+    """
+    Compute dues/activity status for the whole roster at once.
+    
+    Runs one query for members with current dues and one for members with
+    recent attendance, instead of several queries per member. Pass
+    member_ids to limit the computation to those members.
+    """
+    queries = member_status_queries(today, months, member_ids)
+    paid_ids = {member_id for (member_id,) in queries.paid}
+    active_ids = {member_id for (member_id,) in queries.recently_active}
+    
+    statuses = MemberStatusMap()
+    for member_id in paid_ids | active_ids:
+        dues_current = member_id in paid_ids
+        recent_activity = member_id in active_ids
+        statuses[member_id] = MemberStatus(dues_current, recent_activity, dues_current and recent_activity)
+    return statuses
+
+
+def member_status_category(is_active, status):
+    """Classify a member for the status filter and dashboard counters"""
+    if not is_active:
+        return STATUS_DISABLED
+    if not status.dues_current:
+        return STATUS_EXPIRED
+    if status.recent_activity:
+        return STATUS_ACTIVE
+    return STATUS_INACTIVE
+
+
+def refresh_member_status(member_ids=None, today=None):
+    """
+    Recompute member_status rows for the given members (every member if None).
+    
+    Call after any write to dues, attendance or a member's active flag; the
+    caller commits. The nightly rebuild calls it with no ids so date-driven
+    changes (activity window, grace-period rollover) are picked up.
+    """
+    today = today or date.today()
+    
+    members_query = db.session.query(Member.id, Member.is_active)
+    records_query = MemberStatusRecord.query
+    
+    if member_ids is not None:
+        member_ids = {int(member_id) for member_id in member_ids}
+        if not member_ids:
+            return
+        members_query = members_query.filter(Member.id.in_(member_ids))
+        records_query = records_query.filter(MemberStatusRecord.member_id.in_(member_ids))
+    
+    statuses = compute_member_statuses(today, member_ids=member_ids)
+    queries = member_status_queries(today, member_ids=member_ids)
+    last_years = dict(queries.last_dues_years.all())
+    last_dates = dict(queries.last_attendance_dates.all())
+    records = {record.member_id: record for record in records_query}
+    
+    for member_id, is_active in members_query.all():
+        record = records.get(member_id)
+        if record is None:
+            record = MemberStatusRecord(member_id=member_id)
+            db.session.add(record)
+        
+        status = statuses[member_id]
+        record.last_dues_year = last_years.get(member_id)
+        record.last_attendance_date = last_dates.get(member_id)
+        record.dues_current = status.dues_current
+        record.recent_activity = status.recent_activity
+        record.is_truly_active = bool(is_active) and status.truly_active
+        record.status_category = member_status_category(is_active, status)
+        record.computed_on = today
+
+
+def member_status_counts():
+    """Members per status category, counted on the status_category index"""
+    return dict(db.session.query(
+        MemberStatusRecord.status_category,
+        db.func.count(MemberStatusRecord.member_id)
+    ).group_by(MemberStatusRecord.status_category).all())
+
+
 class DuesPayment(db.Model):
     """Track dues payments"""
     __tablename__ = 'dues_payments'
+    __table_args__ = (
+        # One payment per member per year; also serves lookups by member_id
+        db.Index('uq_dues_payments_member_year', 'member_id', 'year', unique=True),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     member_id = db.Column(db.Integer, db.ForeignKey('members.id'), nullable=False)
-    year = db.Column(db.Integer, nullable=False)
+    year = db.Column(db.Integer, nullable=False, index=True)
     amount = db.Column(db.Float, nullable=False)
     payment_date = db.Column(db.Date, nullable=False)
     payment_method = db.Column(db.String(50), default='PayPal')  # PayPal, Cash, Check
@@ -147,9 +301,12 @@ class DuesPayment(db.Model):
 class RoleHistory(db.Model):
     """Track leadership positions over time"""
     __tablename__ = 'role_history'
+    __table_args__ = (
+        db.Index('ix_role_history_current_start', 'is_current', 'start_date'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    member_id = db.Column(db.Integer, db.ForeignKey('members.id'), nullable=False)
+    member_id = db.Column(db.Integer, db.ForeignKey('members.id'), nullable=False, index=True)
     role_name = db.Column(db.String(100), nullable=False)  # President, Treasurer, Board Member, etc.
     start_date = db.Column(db.Date, nullable=False)
     end_date = db.Column(db.Date)
@@ -162,16 +319,47 @@ class RoleHistory(db.Model):
         return f'<RoleHistory {self.member.call_sign} - {self.role_name}>'
 
 
+class Meeting(db.Model):
+    """A club meeting or event that members attend"""
+    __tablename__ = 'meetings'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    meeting_date = db.Column(db.Date, nullable=False, index=True)
+    event_type = db.Column(db.String(20), default='Meeting')  # Meeting, Event, Other
+    event_name = db.Column(db.String(200))  # Name of the event
+    notes = db.Column(db.Text)
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    recorded_by = db.Column(db.String(10))  # Call sign of admin who created it
+    
+    # Set while self-service check-in is open; the kiosk URL contains it
+    checkin_token = db.Column(db.String(32), unique=True)
+    
+    attendance = db.relationship('MeetingAttendance', backref='meeting', lazy=True, cascade='all, delete-orphan')
+    
+    def get_label(self):
+        """Return the event name, or the event type if unnamed"""
+        return self.event_name or self.event_type
+    
+    def __repr__(self):
+        return f'<Meeting {self.meeting_date} - {self.get_label()}>'
+
+
 class MeetingAttendance(db.Model):
     """Track meeting attendance"""
     __tablename__ = 'meeting_attendance'
+    __table_args__ = (
+        db.UniqueConstraint('meeting_id', 'member_id', name='uq_meeting_attendance_meeting_member'),
+        # A member's attendance since a date (recent activity)
+        db.Index('ix_meeting_attendance_member_date', 'member_id', 'meeting_date'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     member_id = db.Column(db.Integer, db.ForeignKey('members.id'), nullable=False)
-    meeting_date = db.Column(db.Date, nullable=False)
+    meeting_id = db.Column(db.Integer, db.ForeignKey('meetings.id'), nullable=False, index=True)
+    # Copied from the meeting so activity/status queries need no join
+    meeting_date = db.Column(db.Date, nullable=False, index=True)
     attended = db.Column(db.Boolean, default=True)
-    event_type = db.Column(db.String(20), default='Meeting')  # Meeting, Event, Other
-    event_name = db.Column(db.String(200))  # Name of the event
     notes = db.Column(db.Text)
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -181,18 +369,299 @@ class MeetingAttendance(db.Model):
         return f'<MeetingAttendance {self.member.call_sign} - {self.meeting_date}>'
 
 
+class MemberStatusRecord(db.Model):
+    """Persisted dues/activity status, maintained by refresh_member_status()"""
+    __tablename__ = 'member_status'
+    
+    member_id = db.Column(db.Integer, db.ForeignKey('members.id'), primary_key=True)
+    last_dues_year = db.Column(db.Integer)
+    last_attendance_date = db.Column(db.Date)
+    dues_current = db.Column(db.Boolean, nullable=False, default=False)
+    recent_activity = db.Column(db.Boolean, nullable=False, default=False)
+    is_truly_active = db.Column(db.Boolean, nullable=False, default=False, index=True)
+    status_category = db.Column(db.String(20), nullable=False, default=STATUS_EXPIRED, index=True)
+    
+    # Date the flags were computed for; the nightly rebuild moves it forward
+    computed_on = db.Column(db.Date, nullable=False, default=date.today)
+    
+    def __repr__(self):
+        return f'<MemberStatusRecord {self.member_id} - {self.status_category}>'
+
+
+class MemberPhoto(db.Model):
+    """Locally cached thumbnails of a member's QRZ photo"""
+    __tablename__ = 'member_photos'
+    
+    member_id = db.Column(db.Integer, db.ForeignKey('members.id'), primary_key=True)
+    source_url = db.Column(db.String(500), nullable=False)  # qrz_photo_url the thumbnails were made from
+    content_hash = db.Column(db.String(16), nullable=False, index=True)
+    cached_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def filename(self, size, ext):
+        """Thumbnail file name under the photo directory"""
+        return photo_filename(self.content_hash, size, ext)
+    
+    def __repr__(self):
+        return f'<MemberPhoto {self.member_id} - {self.content_hash}>'
+
+
+def meeting_attendance_query(meeting_id):
+    """Attendance rows of one meeting (roster edits, check-in counts)"""
+    return MeetingAttendance.query.filter(MeetingAttendance.meeting_id == meeting_id)
+
+
+def check_in_member(meeting, member, recorded_by='KIOSK'):
+    """
+    Add member to the meeting's attendance; returns False if already checked in.
+    
+    A single INSERT ... ON CONFLICT DO NOTHING against the (meeting, member)
+    constraint, so concurrent check-ins never duplicate or lose a row. The
+    caller commits.
+    """
+    result = db.session.execute(
+        sqlite_insert(MeetingAttendance).values(
+            member_id=member.id,
+            meeting_id=meeting.id,
+            meeting_date=meeting.meeting_date,
+            attended=True,
+            recorded_by=recorded_by,
+            created_at=datetime.utcnow()
+        ).on_conflict_do_nothing(index_elements=['meeting_id', 'member_id'])
+    )
+    if result.rowcount == 0:
+        return False
+    
+    refresh_member_status([member.id])
+    return True
+
+
 class AdminLog(db.Model):
     """Audit trail for administrative actions"""
     __tablename__ = 'admin_log'
+    __table_args__ = (
+        # One admin's entries, newest first (audit view), read straight off the index
+        db.Index('ix_admin_log_admin_created', 'admin_call_sign', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     admin_call_sign = db.Column(db.String(10), nullable=False)
     action = db.Column(db.String(200), nullable=False)
-    target_member_call_sign = db.Column(db.String(10))
+    target_member_call_sign = db.Column(db.String(10), index=True)
     details = db.Column(db.Text)
     ip_address = db.Column(db.String(50))
     
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     
     def __repr__(self):
         return f'<AdminLog {self.admin_call_sign} - {self.action}>'
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'admin_call_sign': self.admin_call_sign,
+            'action': self.action,
+            'target_member_call_sign': self.target_member_call_sign,
+            'details': self.details,
+            'ip_address': self.ip_address,
+            'created_at': self.created_at,
+        }
+
+
+class DataVersion(db.Model):
+    """Single-row counter bumped whenever report data changes"""
+    __tablename__ = 'data_version'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    # Bumped only when member rows change (member picker index)
+    member_version = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<DataVersion {self.version}>'
+
+
+# Writes to these models change report output and bump the data version
+VERSIONED_MODELS = (Member, DuesPayment, Meeting, MeetingAttendance, RoleHistory, MemberStatusRecord)
+
+# Member columns that change on login/password updates but never appear in reports
+UNVERSIONED_MEMBER_COLUMNS = {'last_contact', 'updated_at', 'password_hash', 'password_is_temporary'}
+
+
+def get_data_version():
+    """Return (version, updated_at) for the report data"""
+    row = db.session.get(DataVersion, 1)
+    if row is None:
+        return 0, datetime(1970, 1, 1)
+    return row.version, row.updated_at
+
+
+def get_member_version():
+    """Return the counter that changes whenever a member row changes"""
+    row = db.session.get(DataVersion, 1)
+    return row.member_version if row is not None else 0
+
+
+def _changes_report_data(obj):
+    """True if a pending change to obj can affect report output"""
+    if not isinstance(obj, VERSIONED_MODELS):
+        return False
+    if isinstance(obj, Member):
+        state = inspect(obj)
+        if not (state.pending or state.deleted or state.was_deleted):
+            return any(
+                attr.history.has_changes()
+                for attr in state.attrs
+                if attr.key not in UNVERSIONED_MEMBER_COLUMNS
+            )
+    return True
+
+
+@event.listens_for(Session, 'after_flush')
+def _track_flushed_changes(session, flush_context):
+    """Flag the transaction when a versioned row was inserted, updated or deleted"""
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if _changes_report_data(obj):
+            session.info['data_changed'] = True
+            if isinstance(obj, Member):
+                session.info['members_changed'] = True
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _track_bulk_changes(orm_execute_state):
+    """Flag bulk insert/update/delete statements (e.g. query.delete()) against versioned tables"""
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, VERSIONED_MODELS):
+        orm_execute_state.session.info['data_changed'] = True
+        if issubclass(mapper.class_, Member):
+            orm_execute_state.session.info['members_changed'] = True
+
+
+@event.listens_for(Session, 'before_commit')
+def _bump_data_version(session):
+    """Bump the data version in the same transaction as the change"""
+    session.flush()
+    members_changed = int(session.info.pop('members_changed', False))
+    if not session.info.pop('data_changed', False):
+        return
+    
+    result = session.execute(
+        db.update(DataVersion).where(DataVersion.id == 1).values(
+            version=DataVersion.version + 1,
+            member_version=DataVersion.member_version + members_changed,
+            updated_at=datetime.utcnow()
+        )
+    )
+    if result.rowcount == 0:
+        session.add(DataVersion(id=1, version=1, member_version=members_changed))
+        session.flush()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _reset_data_version_flag(session):
+    session.info.pop('data_changed', None)
+    session.info.pop('members_changed', None)
+
+
+# Full-text search over members (SQLite FTS5, external content table kept in sync by triggers)
+MEMBER_SEARCH_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS member_search USING fts5(
+        call_sign, first_name, last_name, email,
+        content='members', content_rowid='id', prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS member_search_insert AFTER INSERT ON members BEGIN
+        INSERT INTO member_search(rowid, call_sign, first_name, last_name, email)
+        VALUES (new.id, new.call_sign, new.first_name, new.last_name, new.email);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS member_search_delete AFTER DELETE ON members BEGIN
+        INSERT INTO member_search(member_search, rowid, call_sign, first_name, last_name, email)
+        VALUES ('delete', old.id, old.call_sign, old.first_name, old.last_name, old.email);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS member_search_update
+    AFTER UPDATE OF call_sign, first_name, last_name, email ON members BEGIN
+        INSERT INTO member_search(member_search, rowid, call_sign, first_name, last_name, email)
+        VALUES ('delete', old.id, old.call_sign, old.first_name, old.last_name, old.email);
+        INSERT INTO member_search(rowid, call_sign, first_name, last_name, email)
+        VALUES (new.id, new.call_sign, new.first_name, new.last_name, new.email);
+    END""",
+]
+
+# bm25 column weights: call sign matches rank above name matches, then email
+MEMBER_SEARCH_RANK = 'bm25(member_search, 10.0, 3.0, 3.0, 1.0)'
+
+for _statement in MEMBER_SEARCH_DDL:
+    event.listen(Member.__table__, 'after_create', db.DDL(_statement).execute_if(dialect='sqlite'))
+
+
+def member_search_available():
+    """True if the member_search FTS table exists in this database"""
+    if db.engine.dialect.name != 'sqlite':
+        return False
+    return db.session.execute(db.text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'member_search'"
+    )).first() is not None
+
+
+def rebuild_member_search_index():
+    """Create the member_search table and triggers if needed and reindex every member"""
+    for statement in MEMBER_SEARCH_DDL:
+        db.session.execute(db.text(statement))
+    db.session.execute(db.text("INSERT INTO member_search(member_search) VALUES ('rebuild')"))
+
+
+def member_search_expression(term):
+    """Turn user input into an FTS5 query: every token must match as a prefix"""
+    tokens = re.findall(r'\w+', term)
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def member_search_ids(term):
+    """Select of member ids matching term, for use in Member.id.in_(...)"""
+    return db.text(
+        "SELECT rowid FROM member_search WHERE member_search MATCH :expression"
+    ).bindparams(expression=member_search_expression(term)).columns(db.column('rowid'))
+
+
+def member_list_query(search='', status_filter='all'):
+    """Members for the admin list (status record eager-loaded), narrowed by search text and status category"""
+    query = Member.query.outerjoin(MemberStatusRecord).options(db.contains_eager(Member.status_record))
+    
+    if search and member_search_available():
+        # Prefix/token match through the FTS index
+        if member_search_expression(search):
+            query = query.filter(Member.id.in_(member_search_ids(search)))
+    elif search:
+        search_term = f"%{search}%"
+        query = query.filter(
+            db.or_(
+                Member.call_sign.ilike(search_term),
+                Member.first_name.ilike(search_term),
+                Member.last_name.ilike(search_term),
+                Member.email.ilike(search_term)
+            )
+        )
+    
+    # Apply status filter (categories are kept current in member_status)
+    if status_filter in (STATUS_ACTIVE, STATUS_INACTIVE, STATUS_EXPIRED, STATUS_DISABLED):
+        return query.filter(MemberStatusRecord.status_category == status_filter)
+    # All active accounts
+    return query.filter(Member.is_active == True)
+
+
+def search_members(term, limit=10, query=None):
+    """Return members matching term, best match first; query narrows the candidates (default: active members)"""
+    expression = member_search_expression(term)
+    if expression is None:
+        return []
+    
+    ranked = db.text(
+        f"SELECT rowid, {MEMBER_SEARCH_RANK} AS rank FROM member_search WHERE member_search MATCH :expression"
+    ).bindparams(expression=expression).columns(db.column('rowid'), db.column('rank')).subquery()
+    if query is None:
+        query = Member.query.filter(Member.is_active == True)
+    return query.join(ranked, ranked.c.rowid == Member.id).order_by(ranked.c.rank, Member.id).limit(limit).all()
@@ -0,0 +1,27 @@
+"""
+Bulk password hashing for imports and mass resets.
+
+Werkzeug's default scrypt hash is deliberately CPU-heavy, so hashing hundreds
+of passwords one after another on a single core is slow. hash_passwords()
+spreads the work over a thread pool sized to the machine: hashlib's scrypt
+releases the GIL, so the threads hash in parallel without starting processes
+that would re-import the calling script (the whole app under python app.py).
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import generate_password_hash
+
+# Below this many passwords the pool start-up costs more than it saves
+MIN_PARALLEL = 4
+
+
+def hash_passwords(passwords, max_workers=None):
+    """Hash each password with generate_password_hash; results keep input order"""
+    passwords = list(passwords)
+    workers = min(max_workers or os.cpu_count() or 1, len(passwords))
+    
+    if len(passwords) < MIN_PARALLEL or workers < 2:
+        return [generate_password_hash(password) for password in passwords]
+    
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='hash-passwords') as executor:
+        return list(executor.map(generate_password_hash, passwords))
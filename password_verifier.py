@@ -0,0 +1,118 @@
+"""
+WVARA Membership Management System - Password Verifier
+
+Runs login password checks on a small, bounded thread pool so a burst of
+scrypt verifications cannot occupy every request thread: the request thread
+waits for its check, so checks in flight (running plus queued) are kept below
+the number of request threads. Checks that would
+queue past the limit, or wait too long to start, fail fast with VerifierBusy.
+"""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import check_password_hash
+import threading
+import time
+
+
+class VerifierBusy(Exception):
+    """The verification queue is full or the check waited too long to start"""
+
+
+def fit_request_threads(max_workers, max_queue, request_threads):
+    """(workers, queue) shrunk so checks in flight hold at most request_threads - 1 request threads"""
+    limit = max(request_threads - 1, 1)
+    max_workers = max(min(max_workers, limit), 1)
+    return max_workers, max(min(max_queue, limit - max_workers), 0)
+
+
+class PasswordVerifier:
+    """check_password_hash behind a concurrency limit and a queue timeout"""
+    
+    def __init__(self, max_workers=2, max_queue=1, queue_timeout=2.0, sample_size=500):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='password-verify')
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._running = 0
+        self._max_queue_depth = 0
+        self._counts = {'verified': 0, 'rejected_full': 0, 'rejected_timeout': 0}
+        self._samples = deque(maxlen=sample_size)  # (queue wait, total) seconds
+    
+    def verify(self, password_hash, password):
+        """True if password matches password_hash; raises VerifierBusy rather than wait in a long queue"""
+        if not self._slots.acquire(blocking=False):
+            self._count('rejected_full')
+            raise VerifierBusy()
+        
+        submitted = time.monotonic()
+        started = threading.Event()
+        wait = [0.0]
+        
+        def run():
+            wait[0] = time.monotonic() - submitted
+            with self._lock:
+                self._running += 1
+            started.set()
+            try:
+                return check_password_hash(password_hash, password)
+            finally:
+                with self._lock:
+                    self._running -= 1
+        
+        with self._lock:
+            self._in_flight += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._in_flight - self._running)
+        
+        try:
+            future = self._executor.submit(run)
+            # cancel() only succeeds while the check is still queued
+            if not started.wait(self.queue_timeout) and future.cancel():
+                self._count('rejected_timeout')
+                raise VerifierBusy()
+            result = future.result()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+        
+        with self._lock:
+            self._counts['verified'] += 1
+            self._samples.append((wait[0], time.monotonic() - submitted))
+        return result
+    
+    def _count(self, name):
+        with self._lock:
+            self._counts[name] += 1
+    
+    def stats(self):
+        """Counters, current queue depth and latency percentiles (ms) over recent checks"""
+        with self._lock:
+            samples = list(self._samples)
+            stats = {
+                'workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'queue_timeout_seconds': self.queue_timeout,
+                'in_flight': self._in_flight,
+                'running': self._running,
+                'queue_depth': self._in_flight - self._running,
+                'max_queue_depth': self._max_queue_depth,
+                **self._counts,
+            }
+        stats['queue_wait_ms'] = percentiles([wait for wait, _ in samples])
+        stats['latency_ms'] = percentiles([total for _, total in samples])
+        return stats
+
+
+def percentiles(values):
+    """p50/p95/max of a list of seconds, in milliseconds"""
+    if not values:
+        return {'p50': None, 'p95': None, 'max': None}
+    values = sorted(values)
+    
+    def at(fraction):
+        return round(values[min(len(values) - 1, int(fraction * len(values)))] * 1000, 1)
+    
+    return {'p50': at(0.5), 'p95': at(0.95), 'max': round(values[-1] * 1000, 1)}
@@ -0,0 +1,81 @@
+"""
+WVARA Membership Management System - Member Photo Cache
+
+Member photos are downloaded once and resized with Pillow into square
+WebP and JPEG thumbnails. Files are named after a hash of the original
+image, so a given name never changes content and can be cached forever.
+"""
+from PIL import Image, ImageOps
+import hashlib
+import io
+import os
+import tempfile
+
+# Thumbnail edge length in pixels
+PHOTO_SIZES = {
+    'small': 64,
+    'medium': 150,
+    'large': 300,
+}
+
+# File extension -> Pillow format and save options
+PHOTO_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpg': ('JPEG', {'quality': 85, 'optimize': True, 'progressive': True}),
+}
+
+MAX_PHOTO_BYTES = 5 * 1024 * 1024
+
+
+def photo_filename(content_hash, size, ext):
+    """File name of one thumbnail"""
+    return f'{content_hash}-{size}.{ext}'
+
+
+class PhotoStore:
+    """Content-addressed thumbnail files in one directory"""
+    
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+    
+    def path(self, filename):
+        return os.path.join(self.directory, filename)
+    
+    def store(self, data):
+        """Write every thumbnail of an image (if not already there); returns its content hash"""
+        content_hash = hashlib.sha256(data).hexdigest()[:16]
+        wanted = [(size, ext) for size in PHOTO_SIZES for ext in PHOTO_FORMATS
+                  if not os.path.exists(self.path(photo_filename(content_hash, size, ext)))]
+        if not wanted:
+            return content_hash
+        
+        image = Image.open(io.BytesIO(data))
+        image = ImageOps.exif_transpose(image).convert('RGB')
+        
+        for size, ext in wanted:
+            edge = PHOTO_SIZES[size]
+            thumbnail = ImageOps.fit(image, (edge, edge), Image.LANCZOS)
+            image_format, options = PHOTO_FORMATS[ext]
+            
+            # Write to a temp file and rename so a half-written thumbnail is never served
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    thumbnail.save(f, image_format, **options)
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, self.path(photo_filename(content_hash, size, ext)))
+            except Exception:
+                os.unlink(tmp_path)
+                raise
+        
+        return content_hash
+    
+    def remove(self, content_hash):
+        """Delete every thumbnail of an image"""
+        for size in PHOTO_SIZES:
+            for ext in PHOTO_FORMATS:
+                try:
+                    os.remove(self.path(photo_filename(content_hash, size, ext)))
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,231 @@
+"""
+WVARA Membership Management System - QRZ Photo Refresher
+
+Looks up member photo URLs on QRZ.com. Lookups share one HTTP session
+(connection reuse), are spaced out per host, and are cached, including
+call signs with no photo (for a shorter time). A batch job refreshes many
+call signs on a background thread with a bounded number of concurrent lookups.
+Job progress can be written to a status file so every worker process sees it.
+"""
+from bs4 import BeautifulSoup, SoupStrainer
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urljoin, urlsplit
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# A running job whose status file has not changed for this long is assumed dead
+STATUS_STALE_AFTER = 120
+
+
+def parse_qrz_photo(html, call_sign, base_url):
+    """Photo URL from a QRZ profile page, or None"""
+    # Only <img> tags matter, so skip building the rest of the tree
+    soup = BeautifulSoup(html, 'html.parser', parse_only=SoupStrainer('img'))
+    # Look for the profile image
+    img_tag = soup.find('img', {'class': 'main-photo'})
+    if not img_tag:
+        # Try alternative selector
+        img_tag = soup.find('img', alt=re.compile(re.escape(call_sign), re.IGNORECASE))
+    
+    if img_tag and img_tag.get('src'):
+        return urljoin(base_url, img_tag['src'])
+    return None
+
+
+class HostRateLimiter:
+    """Spaces requests to the same host at least min_interval seconds apart"""
+    
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._next_allowed = {}
+        self._lock = threading.Lock()
+    
+    def wait(self, url):
+        """Block until a request to url's host is allowed"""
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_allowed.get(host, now))
+            self._next_allowed[host] = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class PhotoRefreshJob:
+    """Progress of one batch refresh"""
+    
+    def __init__(self, total):
+        self.total = total
+        self.done = 0
+        self.found = 0
+        self.not_found = 0
+        self.errors = 0
+        self.started_at = time.time()
+        self.updated_at = self.started_at
+        self.finished_at = None
+    
+    @property
+    def running(self):
+        return self.finished_at is None
+    
+    def to_dict(self):
+        return {
+            'total': self.total,
+            'done': self.done,
+            'found': self.found,
+            'not_found': self.not_found,
+            'errors': self.errors,
+            'running': self.running,
+            'started_at': self.started_at,
+            'updated_at': self.updated_at,
+            'finished_at': self.finished_at,
+        }
+
+
+class QRZPhotoRefresher:
+    """Cached, rate-limited QRZ photo lookups and a background batch job"""
+    
+    def __init__(self, base_url='https://www.qrz.com', max_workers=4, per_host_interval=0.5,
+                 timeout=5, ttl=7 * 86400, negative_ttl=86400, status_path=None):
+        self.base_url = base_url
+        self.status_path = status_path
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.rate_limiter = HostRateLimiter(per_host_interval)
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.job = None
+        self._cache = {}  # call sign -> (photo URL or None, looked up at)
+        self._lock = threading.Lock()
+    
+    def fetch(self, call_sign):
+        """Photo URL from QRZ (None if the page has none); raises on network errors"""
+        url = f"{self.base_url}/db/{call_sign.upper()}"
+        self.rate_limiter.wait(url)
+        response = self.session.get(url, timeout=self.timeout)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return parse_qrz_photo(response.text, call_sign, self.base_url)
+    
+    def download(self, url, max_bytes):
+        """Bytes at url through the shared session and host limiter; raises if larger than max_bytes"""
+        self.rate_limiter.wait(url)
+        with self.session.get(url, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            data = response.raw.read(max_bytes + 1, decode_content=True)
+        if len(data) > max_bytes:
+            raise ValueError(f'Photo larger than {max_bytes} bytes')
+        return data
+    
+    def lookup(self, call_sign, force=False):
+        """Cached fetch; misses are remembered for negative_ttl, hits for ttl"""
+        call_sign = call_sign.upper()
+        now = time.time()
+        with self._lock:
+            cached = self._cache.get(call_sign)
+        if cached and not force:
+            photo_url, looked_up_at = cached
+            if now - looked_up_at < (self.ttl if photo_url else self.negative_ttl):
+                return photo_url
+        
+        photo_url = self.fetch(call_sign)
+        with self._lock:
+            self._cache[call_sign] = (photo_url, time.time())
+        return photo_url
+    
+    def start(self, call_signs, save, save_every=25):
+        """
+        Refresh call_signs in the background. save({call_sign: photo_url})
+        is called from the job thread for each group of photos found.
+        Returns the job, or None if one is already running.
+        """
+        with self._lock:
+            if self.job and self.job.running:
+                return None
+            shared = self._read_status()
+            if shared and shared['running']:
+                return None  # Running in another worker process
+            self.job = PhotoRefreshJob(len(call_signs))
+            self._write_status(self.job)
+        threading.Thread(target=self._run, args=(self.job, list(call_signs), save, save_every),
+                         name='qrz-photo-refresh', daemon=True).start()
+        return self.job
+    
+    def _run(self, job, call_signs, save, save_every):
+        found = {}
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {executor.submit(self.lookup, call_sign): call_sign for call_sign in call_signs}
+                for future in as_completed(futures):
+                    try:
+                        photo_url = future.result()
+                    except Exception as e:
+                        print(f"Error scraping QRZ for {futures[future]}: {e}")
+                        job.errors += 1
+                    else:
+                        if photo_url:
+                            found[futures[future]] = photo_url
+                            job.found += 1
+                        else:
+                            job.not_found += 1
+                    job.done += 1
+                    job.updated_at = time.time()
+                    self._write_status(job)
+                    
+                    if len(found) >= save_every:
+                        save(found)
+                        found = {}
+            if found:
+                save(found)
+        finally:
+            job.finished_at = job.updated_at = time.time()
+            self._write_status(job)
+    
+    def _write_status(self, job):
+        """Replace the status file with job's progress"""
+        if not self.status_path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.status_path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(job.to_dict(), f)
+            os.replace(tmp_path, self.status_path)
+        except OSError as e:
+            print(f"Error writing photo refresh status: {e}")
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+    
+    def _read_status(self):
+        """Progress from the status file (written by any process), or None"""
+        if not self.status_path:
+            return None
+        try:
+            with open(self.status_path) as f:
+                progress = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if progress['running'] and time.time() - progress['updated_at'] > STATUS_STALE_AFTER:
+            progress['running'] = False
+        return progress
+    
+    def progress(self):
+        """Current or last job as a dict, or None"""
+        if self.job and self.job.running:
+            return self.job.to_dict()
+        return self._read_status() or (self.job.to_dict() if self.job else None)
@@ -0,0 +1,63 @@
+"""
+WVARA Membership Management System - Query Plan Check
+
+Runs EXPLAIN QUERY PLAN on the queries that run on every page view or
+status refresh and reports any that would read a whole table instead of
+using an index. `flask --app app check-query-plans` exits non-zero when
+one does, so a missing index is caught before it slows the site down.
+"""
+from datetime import date, datetime
+import re
+
+from models import (db, Member, DuesPayment, Meeting, RoleHistory, AdminLog,
+                    member_status_queries, member_list_query, meeting_attendance_query, STATUS_EXPIRED)
+
+# "SCAN members" reads the whole table; "SCAN members USING INDEX ..." walks an index instead
+FULL_SCAN = re.compile(r'^SCAN (\w+)(?: AS \w+)?$')
+
+
+def hot_queries():
+    """Name -> SELECT statement for each query that must use an index, built by the code the app runs"""
+    today = date.today()
+    statuses = member_status_queries(today, member_ids=[1])
+    roster = member_status_queries(today)
+    return {
+        'paid members (member status)': statuses.paid.statement,
+        'recently active members (member status)': statuses.recently_active.statement,
+        'last dues year (member status)': statuses.last_dues_years.statement,
+        'last attendance date (member status)': statuses.last_attendance_dates.statement,
+        'paid members, whole roster (nightly rebuild)': roster.paid.statement,
+        'recently active, whole roster (nightly rebuild)': roster.recently_active.statement,
+        'member list by status (admin_members)': member_list_query('', STATUS_EXPIRED).order_by(
+            Member.call_sign, Member.id).limit(51).statement,
+        'attendance of a meeting (roster edits, check-in count)': meeting_attendance_query(1).statement,
+        'meeting by date, type and name (attendance form)': db.select(Meeting).where(
+            Meeting.meeting_date == today, Meeting.event_type == 'Meeting', Meeting.event_name == ''),
+        'dues by year (dues matrix, reports)': db.select(DuesPayment).where(DuesPayment.year == today.year),
+        'current roles (admin_roles)': db.select(RoleHistory).where(
+            RoleHistory.is_current == True).order_by(RoleHistory.start_date.desc()),
+        "a member's roles": db.select(RoleHistory).where(RoleHistory.member_id == 1),
+        'member by email (imports)': db.select(Member).where(Member.email == 'member@example.com'),
+        'member by call sign (login)': db.select(Member).where(Member.call_sign == 'W6SAL'),
+        'audit log by admin': db.select(AdminLog).where(
+            AdminLog.admin_call_sign == 'W6SAL').order_by(AdminLog.created_at.desc(), AdminLog.id.desc()).limit(50),
+        'audit log retention': db.select(AdminLog).where(AdminLog.created_at < datetime(today.year, 1, 1)),
+    }
+
+
+def explain(statement):
+    """EXPLAIN QUERY PLAN detail lines for a statement"""
+    compiled = statement.compile(db.engine, compile_kwargs={'render_postcompile': True})
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    with db.engine.connect() as conn:
+        return [row[-1] for row in conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {compiled}', params)]
+
+
+def check_query_plans():
+    """(name, plan lines, tables scanned in full) for every hot query"""
+    results = []
+    for name, statement in hot_queries().items():
+        plan = explain(statement)
+        scanned = [match.group(1) for match in map(FULL_SCAN.match, plan) if match]
+        results.append((name, plan, scanned))
+    return results
@@ -0,0 +1,121 @@
+"""
+WVARA Membership Management System - Login Rate Limiter
+
+Token buckets keyed by client IP and by call sign, checked before any
+expensive login work (CAPTCHA rendering, password verification). Buckets
+live in process memory by default; the SQLite store shares them between
+worker processes.
+"""
+import threading
+import time
+
+from shared_sqlite import SharedSQLiteFile
+
+# Buckets untouched this long are full again and can be forgotten
+STALE_AFTER = 3600
+
+
+def refill(tokens, updated, capacity, rate, now):
+    """Tokens in a bucket after refilling since updated"""
+    return min(capacity, tokens + (now - updated) * rate)
+
+
+class MemoryBucketStore:
+    """Buckets in a dict; each worker process has its own"""
+    
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._buckets = {}
+        self._lock = threading.Lock()
+    
+    def take(self, key, cost, capacity, rate):
+        """Take cost tokens if available; returns (allowed, tokens left)"""
+        now = time.time()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = refill(tokens, updated, capacity, rate, now)
+            allowed = tokens >= max(cost, 1)
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            
+            if len(self._buckets) > self.max_keys:
+                self._buckets = {k: v for k, v in self._buckets.items() if now - v[1] < STALE_AFTER}
+        return allowed, tokens
+
+
+class SQLiteBucketStore:
+    """Buckets in a small SQLite file shared by every worker process"""
+    
+    PRUNE_EVERY = 1000
+    
+    def __init__(self, path):
+        self.db = SharedSQLiteFile(path, '''
+            CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+                key TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated REAL NOT NULL
+            )
+        ''')
+        self._takes = 0
+    
+    def take(self, key, cost, capacity, rate):
+        """Take cost tokens if available; returns (allowed, tokens left)"""
+        now = time.time()
+        with self.db.transaction() as conn:
+            row = conn.execute('SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?', (key,)).fetchone()
+            tokens = refill(*row, capacity, rate, now) if row else capacity
+            allowed = tokens >= max(cost, 1)
+            if allowed:
+                tokens -= cost
+            conn.execute('''
+                INSERT INTO rate_limit_buckets (key, tokens, updated) VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated
+            ''', (key, tokens, now))
+            
+            self._takes += 1
+            if self._takes % self.PRUNE_EVERY == 0:
+                conn.execute('DELETE FROM rate_limit_buckets WHERE updated < ?', (now - STALE_AFTER,))
+        return allowed, tokens
+
+
+class RateLimiter:
+    """Token bucket: capacity requests in a burst, refilled at per_minute"""
+    
+    def __init__(self, store, name, capacity, per_minute):
+        self.store = store
+        self.name = name
+        self.capacity = capacity
+        self.rate = per_minute / 60.0
+        self.allowed = 0
+        self.rejected = 0
+    
+    def hit(self, key, cost=1):
+        """
+        Take cost tokens from key's bucket. Returns 0 if allowed, otherwise
+        the seconds until a request would be. cost=0 only checks.
+        """
+        allowed, tokens = self.store.take(f'{self.name}:{key}', cost, self.capacity, self.rate)
+        if allowed:
+            self.allowed += 1
+            return 0
+        self.rejected += 1
+        return max(1, int((max(cost, 1) - tokens) / self.rate) + 1)
+    
+    def stats(self):
+        """Configuration and allow/reject counts for this process"""
+        return {
+            'capacity': self.capacity,
+            'per_minute': self.rate * 60,
+            'allowed': self.allowed,
+            'rejected': self.rejected,
+        }
+
+
+def create_bucket_store(backend, sqlite_path=None):
+    """Bucket store for the configured backend ('memory' or 'sqlite')"""
+    if backend == 'sqlite':
+        return SQLiteBucketStore(sqlite_path)
+    if backend == 'memory':
+        return MemoryBucketStore()
+    raise ValueError(f'Unknown rate limit backend: {backend}')
@@ -0,0 +1,79 @@
+"""
+WVARA Membership Management System - Report Cache
+
+Generated report files are stored on disk, keyed on the report request and
+the data version, so an unchanged report is served without regenerating it.
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+
+class ReportCache:
+    """Bounded on-disk cache of report files with least-recently-used eviction"""
+    
+    def __init__(self, directory, max_entries=32):
+        self.directory = directory
+        self.max_entries = max_entries
+    
+    @staticmethod
+    def make_key(*parts):
+        """Build a cache key (also used as the ETag) from the request and data version"""
+        return hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()[:32]
+    
+    def _paths(self, key):
+        return os.path.join(self.directory, f'{key}.bin'), os.path.join(self.directory, f'{key}.json')
+    
+    def get(self, key):
+        """Return (path, meta) for a cached report, or None on a miss"""
+        data_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, 'r') as meta_file:
+                meta = json.load(meta_file)
+            # Touch the file so eviction sees it as recently used
+            os.utime(data_path)
+        except (OSError, ValueError):
+            return None
+        return data_path, meta
+    
+    def put(self, key, chunks, meta):
+        """Write report chunks to disk and return (path, meta)"""
+        os.makedirs(self.directory, exist_ok=True)
+        data_path, meta_path = self._paths(key)
+        
+        # Write to a temp file first so readers never see a partial report
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                for chunk in chunks:
+                    tmp_file.write(chunk)
+            os.replace(tmp_path, data_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        
+        with open(meta_path, 'w') as meta_file:
+            json.dump(meta, meta_file)
+        
+        self.evict()
+        return data_path, meta
+    
+    def evict(self):
+        """Remove least recently used reports beyond max_entries"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.bin'):
+                path = os.path.join(self.directory, name)
+                try:
+                    entries.append((os.path.getmtime(path), name[:-4]))
+                except OSError:
+                    continue
+        
+        entries.sort(reverse=True)
+        for _, key in entries[self.max_entries:]:
+            for path in self._paths(key):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
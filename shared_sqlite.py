@@ -0,0 +1,44 @@
+"""
+WVARA Membership Management System - Shared SQLite File
+
+A small SQLite file that every worker process reads and writes, used by
+the stores that must see the same state in all workers (login rate
+limits, issued CAPTCHAs). Each thread gets its own autocommit connection,
+and a connection is never reused in a forked child.
+"""
+from contextlib import contextmanager
+import os
+import sqlite3
+import threading
+
+
+class SharedSQLiteFile:
+    """SQLite file with one connection per thread and per process"""
+    
+    def __init__(self, path, schema):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(schema)
+        conn.close()
+    
+    def connect(self):
+        """One autocommit connection per thread, never shared with a forked child"""
+        if getattr(self._local, 'pid', None) != os.getpid():
+            self._local.conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            self._local.pid = os.getpid()
+        return self._local.conn
+    
+    @contextmanager
+    def transaction(self):
+        """Write transaction that holds the lock from the first read, so other workers wait"""
+        conn = self.connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
@@ -0,0 +1,61 @@
+"""
+WVARA Membership Management System - SQLite Connection Profile
+
+Sets PRAGMAs on every new database connection through a SQLAlchemy
+engine event. The production profile uses WAL (readers never block the
+writer), waits on locks instead of failing with "database is locked",
+syncs less often and gives each connection a larger cache and memory map.
+"""
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+# PRAGMAs shown by the startup report
+REPORTED_PRAGMAS = ('journal_mode', 'busy_timeout', 'synchronous', 'cache_size', 'mmap_size', 'foreign_keys')
+
+
+def pooled_url(url):
+    """False for in-memory SQLite, which uses a single-connection pool that takes no size options"""
+    url = make_url(url)
+    if url.get_backend_name() != 'sqlite':
+        return True
+    return url.database not in (None, '', ':memory:') and url.query.get('mode') != 'memory'
+
+
+def profile_pragmas(config):
+    """(name, value) PRAGMAs for the configured SQLITE_PROFILE, in the order they are set"""
+    profile = config['SQLITE_PROFILE']
+    if profile == 'default':
+        return []
+    if profile != 'production':
+        raise ValueError(f'Unknown SQLite profile: {profile}')
+    return [
+        ('journal_mode', 'WAL'),
+        ('busy_timeout', config['SQLITE_BUSY_TIMEOUT_MS']),
+        ('synchronous', config['SQLITE_SYNCHRONOUS']),
+        ('cache_size', -config['SQLITE_CACHE_SIZE_KB']),  # Negative values are KiB, not pages
+        ('mmap_size', config['SQLITE_MMAP_SIZE']),
+        ('foreign_keys', 'ON'),
+    ]
+
+
+def apply_sqlite_profile(engine, pragmas):
+    """Run pragmas on each connection the engine opens"""
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+    
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+
+
+def pragma_report(engine):
+    """Effective value of each reported PRAGMA on a pooled connection"""
+    if engine.dialect.name != 'sqlite':
+        return {}
+    with engine.connect() as conn:
+        return {name: conn.exec_driver_sql(f'PRAGMA {name}').scalar() for name in REPORTED_PRAGMAS}
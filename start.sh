@@ -1,5 +1,7 @@
 #!/bin/bash
 # WVARA Membership System Startup Script
+# Usage: ./start.sh          Production server (Gunicorn, several worker processes)
+#        ./start.sh --dev    Development server with the debugger (single process)
 
 echo "=========================================="
 echo "WVARA Membership Management System"
@@ -21,7 +23,7 @@ echo "Installing dependencies..."
 pip install -q -r requirements.txt
 
 # Check if database exists
-if [ ! -f "WVARA_membership.db" ]; then
+if [ ! -f "instance/WVARA_membership.db" ]; then
     echo ""
     echo "Database not found. Initializing database..."
     echo ""
@@ -40,4 +42,16 @@ echo "Press Ctrl+C to stop the server"
 echo ""
 
 # Start the application
-python app.py
+if [ "$1" == "--dev" ]; then
+    python app.py
+else
+    # Gunicorn workers only import the app, so bring the database up to date first
+    echo "Applying database migrations..."
+    flask --app app db upgrade || exit 1
+    flask --app app rebuild-member-status
+    flask --app app rebuild-search-index
+    echo ""
+    echo "Reload after an update with: kill -HUP \$(cat instance/gunicorn.pid)"
+    echo ""
+    exec gunicorn -c gunicorn.conf.py app:app
+fi
@@ -0,0 +1,53 @@
+// Member picker: typeahead input + datalist that fills a hidden member id field.
+// The input's data-source attribute is the member autocomplete URL.
+function memberPicker(inputId, hiddenId) {
+    const input = document.getElementById(inputId);
+    const hidden = document.getElementById(hiddenId);
+    const options = document.getElementById(input.getAttribute('list'));
+    let labels = {};
+    let timer = null;
+    
+    input.addEventListener('input', function() {
+        hidden.value = labels[input.value] || '';
+        clearTimeout(timer);
+        if (hidden.value || !input.value.trim()) {
+            return;
+        }
+        timer = setTimeout(function() {
+            fetch(input.dataset.source + '?q=' + encodeURIComponent(input.value))
+                .then(response => response.json())
+                .then(data => {
+                    options.innerHTML = '';
+                    labels = {};
+                    data.results.forEach(member => {
+                        const label = member.call_sign + ' - ' + member.name;
+                        labels[label] = member.id;
+                        const option = document.createElement('option');
+                        option.value = label;
+                        options.appendChild(option);
+                    });
+                    hidden.value = labels[input.value] || '';
+                });
+        }, 150);
+    });
+    
+    input.form.addEventListener('submit', function(e) {
+        if (!hidden.value) {
+            e.preventDefault();
+            alert('Please choose a member from the list.');
+            input.focus();
+        }
+    });
+    
+    return {
+        set: function(memberId, label) {
+            labels[label] = memberId;
+            input.value = label;
+            hidden.value = memberId;
+        },
+        clear: function() {
+            input.value = '';
+            hidden.value = '';
+        }
+    };
+}